@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Auto-tuner - Watch Out
+Benchmarks every registered model variant on every available execution provider,
+picks the fastest one whose detections agree with the reference on a calibration
+set, and caches the choice per machine
+"""
+
+import hashlib
+import json
+import os
+import platform
+import time
+import logging
+
+from frame_sources import load_frames
+from preprocessing import Preprocessor
+from postprocessing import create_decoder
+from inference_session import create_session, resolve_providers, model_fingerprint, CPU_PROVIDER
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE_NAME = "autotune.json"
+CACHE_VERSION = 2
+
+
+def machine_fingerprint(providers):
+    """Identifies the hardware and ONNX Runtime build a tuning result is valid for"""
+    import onnxruntime as ort
+    parts = [
+        platform.system(),
+        platform.machine(),
+        platform.processor(),
+        str(os.cpu_count()),
+        ort.__version__,
+        ",".join(providers),
+    ]
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()[:24]
+
+
+class AutoTuner:
+    """Chooses a (model variant, execution provider) pair for this machine
+
+    The first variant on the CPU provider is the accuracy reference. A candidate
+    passes the gate when it reports the same face count as the reference on at
+    least min_agreement of the calibration frames; the fastest passing candidate
+    wins. Agreement only means something when the reference sees faces, so
+    without a calibration set, or when the reference finds faces on fewer than
+    min_face_frames of it, only the reference variant is kept and the tuner
+    just picks its fastest provider. Results are cached in cache_dir keyed by
+    the machine fingerprint, the model files and the tuning settings, so tuning
+    runs once per machine.
+    """
+
+    def __init__(self, variants, providers, ort_settings, cache_dir="", postprocessor="components",
+                 threshold=0.8, calibration_path="", num_frames=30, min_agreement=0.95,
+                 min_face_frames=0.5, frame_size=(640, 480), warmup_runs=3):
+        self.variants = dict(variants)  # name -> model path, the first one is the reference
+        self.providers = resolve_providers(providers)
+        self.ort_settings = ort_settings
+        self.cache_dir = cache_dir
+        self.postprocessor = postprocessor
+        self.threshold = threshold
+        self.calibration_path = calibration_path
+        self.num_frames = num_frames
+        self.min_agreement = min_agreement
+        self.min_face_frames = min_face_frames
+        self.frame_size = frame_size
+        self.warmup_runs = warmup_runs
+
+    @property
+    def calibrated(self):
+        """Whether a calibration set exists, synthetic frames cannot check accuracy"""
+        return bool(self.calibration_path) and os.path.exists(self.calibration_path)
+
+    @property
+    def cache_path(self):
+        return os.path.join(self.cache_dir, CACHE_FILE_NAME) if self.cache_dir else ""
+
+    def candidates(self):
+        """(variant, model path, provider) for every variant whose model file exists"""
+        result = []
+        for name, model_path in self.variants.items():
+            if not os.path.exists(model_path):
+                logger.warning(f"Model variant '{name}' not found: {model_path}")
+                continue
+            result.extend((name, model_path, provider) for provider in self.providers)
+        return result
+
+    def cache_key(self):
+        """Changes with the machine, the model files and the settings that affect the measurements"""
+        parts = [machine_fingerprint(self.providers), str(CACHE_VERSION), str(self.min_agreement),
+                 str(self.min_face_frames), self.calibration_path, str(self.calibrated), json.dumps(self.ort_settings, sort_keys=True)]
+        for name, model_path in self.variants.items():
+            if os.path.exists(model_path):
+                parts.append(f"{name}={model_fingerprint(model_path)}")
+        return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()[:24]
+
+    def select(self, force=False):
+        """Returns the chosen {'variant', 'model_path', 'provider', ...}, None if nothing can run"""
+        candidates = self.candidates()
+        if not candidates:
+            return None
+        if not self.calibrated:
+            # Without a calibration set only the providers of the reference variant are compared
+            reference_name = next(iter(self.variants))
+            candidates = [c for c in candidates if c[0] == reference_name]
+            if not candidates:
+                return None
+        if len(candidates) == 1:
+            name, model_path, provider = candidates[0]
+            return {'variant': name, 'model_path': model_path, 'provider': provider}
+
+        key = self.cache_key()
+        if not force:
+            choice = self._load_cache().get(key)
+            if choice and os.path.exists(choice['model_path']) and choice['provider'] in self.providers:
+                logger.info(f"Auto-tune: using cached choice '{choice['variant']}' on {choice['provider']}")
+                return choice
+
+        choice = self.tune(candidates)
+        if choice is not None:
+            self._save_cache(key, choice)
+        return choice
+
+    def tune(self, candidates):
+        """Benchmarks every candidate and returns the fastest one that passes the accuracy gate"""
+        # The first variant on the CPU provider is the accuracy reference
+        reference_name = next(iter(self.variants))
+        calibrated = self.calibrated
+        if not calibrated:
+            logger.warning(f"Auto-tune: calibration set '{self.calibration_path}' not found, "
+                           f"only choosing a provider for the reference variant '{reference_name}'")
+            candidates = [c for c in candidates if c[0] == reference_name]
+        frames = load_frames(self.calibration_path if calibrated else "", self.num_frames, *self.frame_size)
+        logger.info(f"Auto-tune: {len(candidates)} candidates on {len(frames)} "
+                    f"{self.calibration_path if calibrated else 'synthetic'} frames")
+
+        candidates = sorted(candidates, key=lambda c: (c[0] != reference_name, c[2] != CPU_PROVIDER))
+        reference_counts = None
+        results = []
+        for name, model_path, provider in candidates:
+            if not calibrated and name != reference_name:
+                continue
+            measured = self.measure(model_path, provider, frames)
+            if measured is None:
+                continue
+            fps, counts = measured
+            if reference_counts is None:
+                reference_counts = counts
+                face_frames = sum(count > 0 for count in counts) / len(frames)
+                if calibrated and face_frames < self.min_face_frames:
+                    logger.warning(f"Auto-tune: the reference finds faces on only {face_frames:.0%} of the "
+                                   f"calibration frames (needs {self.min_face_frames:.0%}), only choosing a "
+                                   f"provider for the reference variant '{reference_name}'")
+                    calibrated = False
+            agreement = sum(a == b for a, b in zip(counts, reference_counts)) / len(frames)
+            passed = agreement >= self.min_agreement
+            results.append({'variant': name, 'model_path': model_path, 'provider': provider,
+                            'fps': fps, 'agreement': agreement, 'passed': passed})
+            logger.info(f"Auto-tune: {name:<12} {provider:<28} {fps:8.1f} FPS  "
+                        f"agreement {agreement:6.1%}{'' if passed else '  (rejected)'}")
+
+        passing = [r for r in results if r['passed']]
+        if not passing:
+            return None
+        choice = max(passing, key=lambda r: r['fps'])
+        choice['tuned_at'] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        logger.info(f"Auto-tune: chose '{choice['variant']}' on {choice['provider']} ({choice['fps']:.1f} FPS)")
+        return choice
+
+    def measure(self, model_path, provider, frames):
+        """(FPS, face count per frame) for one candidate, None if it cannot run on this provider"""
+        try:
+            session = create_session(model_path, [provider], self.ort_settings, self.cache_dir)
+            if session.get_providers()[0] != provider:
+                logger.info(f"Auto-tune: {provider} is not usable for {model_path}, skipped")
+                return None
+            model_input = session.get_inputs()[0]
+            output_names = [session.get_outputs()[0].name]
+            preprocessor = Preprocessor(model_input.shape[3], model_input.shape[2])
+            decoder = create_decoder(self.postprocessor, self.threshold)
+
+            def detect(frame):
+                heatmap = session.run(output_names, {model_input.name: preprocessor(frame)})[0][0, 0]
+                return decoder.decode(heatmap, frame.shape[1], frame.shape[0])[0]
+
+            for frame in frames[:self.warmup_runs]:
+                detect(frame)
+            started = time.perf_counter()
+            counts = [detect(frame) for frame in frames]
+            elapsed = time.perf_counter() - started
+            return len(frames) / elapsed if elapsed > 0 else float('inf'), counts
+        except Exception as e:
+            logger.warning(f"Auto-tune: {model_path} on {provider} failed: {e}")
+            return None
+
+    def _load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable auto-tune cache {self.cache_path}: {e}")
+            return {}
+
+    def _save_cache(self, key, choice):
+        if not self.cache_path:
+            return
+        cache = self._load_cache()
+        cache[key] = choice
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{self.cache_path}.tmp-{os.getpid()}"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Unable to write auto-tune cache {self.cache_path}: {e}")
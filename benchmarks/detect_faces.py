@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Detection benchmark - Watch Out
+Runs PrivacyGuard.detect_faces with the real model.onnx across execution providers,
+frame resolutions and detection thresholds, and the post-processors across face counts.
+Writes machine-readable JSON and can flag regressions against a saved baseline.
+
+Usage: python -m benchmarks.detect_faces [--output results.json] [--baseline baseline.json]
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+
+import numpy as np
+import onnxruntime as ort
+
+from config import EXECUTION_PROVIDERS
+from frame_sources import load_frames
+from main import PrivacyGuard
+from postprocessing import DECODERS, create_decoder
+
+DEFAULT_RESOLUTIONS = ("320x240", "640x480", "1280x720")
+DEFAULT_THRESHOLDS = (0.5, 0.7, 0.9)
+DEFAULT_FACES = (0, 1, 2, 4, 8)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, None where it cannot be read
+
+    It only grows over the run, so it is reported once for the whole benchmark, not per case.
+    """
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / 2**20
+        except Exception:
+            return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def parse_resolution(text):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def preload_frames(source_path, count, resolution):
+    """Frames preloaded into memory so decoding files is not part of the measurement"""
+    try:
+        return load_frames(source_path, count, *resolution, loop=True)
+    except RuntimeError as e:
+        raise SystemExit(str(e))
+
+
+def make_face_heatmap(num_faces, rng, shape=(60, 80)):
+    """Heatmap with num_faces separated Gaussian peaks on low background noise"""
+    heatmap = rng.uniform(0, 60, shape).astype(np.float32)
+    rows, cols = np.mgrid[0:shape[0], 0:shape[1]]
+    # One face per cell of a coarse grid keeps the peaks apart
+    grid = int(np.ceil(np.sqrt(max(num_faces, 1))))
+    cells = rng.permutation(grid * grid)[:num_faces]
+    cell_h, cell_w = shape[0] / grid, shape[1] / grid
+    for cell in cells:
+        cy = (cell // grid + 0.5) * cell_h
+        cx = (cell % grid + 0.5) * cell_w
+        sigma = max(1.5, min(cell_h, cell_w) / 6)
+        peak = np.exp(-((rows - cy) ** 2 + (cols - cx) ** 2) / (2 * sigma ** 2))
+        heatmap = np.maximum(heatmap, 250 * peak)
+    return heatmap.astype(np.uint8)
+
+
+def summarize(latencies, detected):
+    latencies = np.asarray(latencies)
+    return {
+        'fps': len(latencies) / latencies.sum() if latencies.sum() > 0 else None,
+        'mean_ms': float(latencies.mean() * 1000),
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p99_ms': float(np.percentile(latencies, 99) * 1000),
+        'mean_faces': float(np.mean(detected)),
+    }
+
+
+def time_calls(fn, inputs, warmup):
+    for item in inputs[:warmup]:
+        fn(item)
+    latencies, detected = [], []
+    for item in inputs:
+        start = time.perf_counter()
+        count, _ = fn(item)
+        latencies.append(time.perf_counter() - start)
+        detected.append(count)
+    return latencies, detected
+
+
+def bench_pipeline(guard, args, results):
+    """detect_faces end to end: preprocessing, inference and post-processing"""
+    resolutions = [parse_resolution(r) for r in args.resolutions]
+    frames = {res: preload_frames(args.source_path, args.frames, res) for res in resolutions}
+
+    for provider in args.providers:
+        guard.execution_providers = [provider]
+        if not guard.load_model():
+            print(f"Skipping {provider}: model failed to load", file=sys.stderr)
+            continue
+        actual = guard.session.get_providers()[0]
+        if actual != provider:
+            print(f"Skipping {provider}: session fell back to {actual}", file=sys.stderr)
+            continue
+
+        for res in resolutions:
+            for threshold in args.thresholds:
+                guard.decoder = create_decoder(guard.postprocessor, threshold)
+                latencies, detected = time_calls(guard.detect_faces, frames[res], args.warmup)
+                key = f"pipeline/{provider}/{res[0]}x{res[1]}/t{threshold}"
+                results[key] = {'provider': provider, 'resolution': f"{res[0]}x{res[1]}",
+                                'threshold': threshold, **summarize(latencies, detected)}
+                print(f"{key:<52} {results[key]['fps']:>9.1f} FPS  p50 {results[key]['p50_ms']:7.2f} ms  "
+                      f"p99 {results[key]['p99_ms']:7.2f} ms")
+
+
+def bench_postprocess(guard, args, results):
+    """Post-processors on heatmaps with a known number of faces"""
+    rng = np.random.default_rng(0)
+    w, h = 640, 480
+    for faces in args.faces:
+        heatmaps = [make_face_heatmap(faces, rng) for _ in range(args.frames)]
+        for postprocessor, threshold in ((p, t) for p in args.decoders for t in args.thresholds):
+            decoder = create_decoder(postprocessor, threshold)
+            latencies, detected = time_calls(lambda m: decoder.decode(m, w, h), heatmaps, args.warmup)
+            key = f"postprocess/{decoder.name}/faces{faces}/t{threshold}"
+            results[key] = {'decoder': decoder.name, 'faces': faces, 'threshold': threshold,
+                            **summarize(latencies, detected)}
+            print(f"{key:<52} {results[key]['fps']:>9.1f} FPS  p50 {results[key]['p50_ms']:7.3f} ms  "
+                  f"p99 {results[key]['p99_ms']:7.3f} ms")
+
+
+def compare(results, baseline, tolerance):
+    """Cases slower than the baseline by more than tolerance (FPS or p99), as printable lines"""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base or not base.get('fps') or not result.get('fps'):
+            continue
+        fps_change = result['fps'] / base['fps'] - 1
+        p99_change = result['p99_ms'] / base['p99_ms'] - 1 if base['p99_ms'] else 0.0
+        if fps_change < -tolerance or p99_change > tolerance:
+            regressions.append(f"{key}: FPS {base['fps']:.1f} -> {result['fps']:.1f} ({fps_change:+.0%}), "
+                               f"p99 {base['p99_ms']:.2f} -> {result['p99_ms']:.2f} ms ({p99_change:+.0%})")
+    return regressions
+
+
+def main():
+    available = ort.get_available_providers()
+    default_providers = [p for p in EXECUTION_PROVIDERS if p in available] or ['CPUExecutionProvider']
+
+    parser = argparse.ArgumentParser(description="detect_faces benchmark")
+    parser.add_argument('--providers', nargs='+', default=default_providers,
+                        help=f"Execution providers to compare (available: {', '.join(available)})")
+    parser.add_argument('--resolutions', nargs='+', default=DEFAULT_RESOLUTIONS, help="Frame sizes, WxH")
+    parser.add_argument('--thresholds', nargs='+', type=float, default=DEFAULT_THRESHOLDS)
+    parser.add_argument('--faces', nargs='+', type=int, default=DEFAULT_FACES,
+                        help="Faces per heatmap for the post-processing cases")
+    parser.add_argument('--decoders', nargs='+', choices=sorted(DECODERS), default=sorted(DECODERS),
+                        help="Post-processors for the heatmap cases")
+    parser.add_argument('--frames', type=int, default=100, help="Measured frames per case")
+    parser.add_argument('--warmup', type=int, default=5, help="Unmeasured calls before each case")
+    parser.add_argument('--source-path', help="Video file or image directory instead of synthetic frames")
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    parser.add_argument('--baseline', help="Compare against a previously written JSON file")
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help="Allowed FPS drop / p99 increase before a case counts as a regression")
+    args = parser.parse_args()
+
+    # Keep the benchmark output readable
+    logging.getLogger().setLevel(logging.ERROR)
+
+    # Uses the user's configuration (ORT settings, post-processor, model cache) like the app does
+    guard = PrivacyGuard()
+    guard.autotune_enabled = False  # Each provider is measured explicitly
+    results = {}
+    bench_pipeline(guard, args, results)
+    bench_postprocess(guard, args, results)
+
+    report = {
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'machine': {
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'python': platform.python_version(),
+            'onnxruntime': ort.__version__,
+        },
+        'source': args.source_path or "synthetic",
+        'peak_rss_mb': peak_rss_mb(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        missing = sorted(set(baseline) - set(results))
+        if missing:
+            print(f"{len(missing)} baseline cases were not run")
+        if regressions:
+            print(f"{len(regressions)} regressions against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Post-processing micro-benchmark - Watch Out
+Compares the vectorized ComponentDecoder against the original per-label loop
+
+Usage: python -m benchmarks.postprocessing [--repeat N]
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from postprocessing import ComponentDecoder
+
+
+def legacy_decode(heatmap, w, h, threshold):
+    """The original per-component loop from PrivacyGuard.detect_faces, kept as the reference"""
+    from scipy import ndimage
+
+    heatmap_norm = heatmap.astype(np.float32) / 255.0
+    heatmap_binary = (heatmap_norm > threshold).astype(np.uint8)
+    labeled_array, num_features = ndimage.label(heatmap_binary)
+
+    detected_faces = []
+    for i in range(1, num_features + 1):
+        component_mask = (labeled_array == i)
+        if np.sum(component_mask) < 5:
+            continue
+        rows, cols = np.where(component_mask)
+        min_row, max_row = rows.min(), rows.max()
+        min_col, max_col = cols.min(), cols.max()
+
+        x1 = int(min_col * w / heatmap.shape[1])
+        y1 = int(min_row * h / heatmap.shape[0])
+        x2 = int((max_col + 1) * w / heatmap.shape[1])
+        y2 = int((max_row + 1) * h / heatmap.shape[0])
+        x1 = max(0, min(x1, w-1))
+        y1 = max(0, min(y1, h-1))
+        x2 = max(x1+1, min(x2, w))
+        y2 = max(y1+1, min(y2, h))
+
+        region_confidence = np.mean(heatmap_norm[min_row:max_row+1, min_col:max_col+1])
+        detected_faces.append({'bbox': (x1, y1, x2, y2), 'confidence': region_confidence})
+    return len(detected_faces), detected_faces
+
+
+def make_heatmaps(count, shape=(60, 80), seed=0):
+    """Smoothed noise heatmaps; low thresholds on these give many noisy components"""
+    rng = np.random.default_rng(seed)
+    maps = []
+    for _ in range(count):
+        noise = rng.integers(0, 256, shape, dtype=np.uint8)
+        maps.append(cv2.GaussianBlur(noise, (3, 3), 0))
+    return maps
+
+
+def same_result(a, b):
+    if a[0] != b[0]:
+        return False
+    for fa, fb in zip(a[1], b[1]):
+        if fa['bbox'] != fb['bbox'] or abs(float(fa['confidence']) - float(fb['confidence'])) > 1e-5:
+            return False
+    return True
+
+
+def time_per_call(fn, heatmaps, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for heatmap in heatmaps:
+            fn(heatmap)
+    return (time.perf_counter() - start) / (repeat * len(heatmaps))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Heatmap post-processing micro-benchmark")
+    parser.add_argument('--repeat', type=int, default=5, help="Passes over the heatmap set")
+    parser.add_argument('--maps', type=int, default=50, help="Number of heatmaps")
+    args = parser.parse_args()
+
+    w, h = 640, 480
+    heatmaps = make_heatmaps(args.maps)
+
+    print(f"{'threshold':>9} {'components':>10} {'legacy (us)':>12} {'vectorized (us)':>16} {'speedup':>8}")
+    for threshold in (0.3, 0.45, 0.5, 0.55, 0.8):
+        decoder = ComponentDecoder(threshold)
+        for heatmap in heatmaps:
+            if not same_result(decoder.decode(heatmap, w, h), legacy_decode(heatmap, w, h, threshold)):
+                raise SystemExit(f"Result mismatch at threshold {threshold}")
+
+        components = np.mean([decoder.decode(m, w, h)[0] for m in heatmaps])
+        legacy = time_per_call(lambda m: legacy_decode(m, w, h, threshold), heatmaps, args.repeat)
+        vectorized = time_per_call(lambda m: decoder.decode(m, w, h), heatmaps, args.repeat)
+        print(f"{threshold:>9.2f} {components:>10.1f} {legacy * 1e6:>12.1f} {vectorized * 1e6:>16.1f} "
+              f"{legacy / vectorized:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Camera channel - Watch Out
+Per-camera state so one PrivacyGuard can watch several cameras with a shared model
+"""
+
+import time
+import logging
+
+from frame_grabber import FrameGrabber
+from scheduler import STATE_IDLE, STATE_CONFIRMING, STATE_ACTIVE
+
+logger = logging.getLogger(__name__)
+
+
+class CameraChannel:
+    """Frame source, grabber, motion gate, tracker, tiler and privacy votes of one camera
+
+    Each channel decides on its own whether it wants privacy mode; PrivacyGuard
+    combines the channels (privacy is on while any channel wants it).
+    """
+
+    def __init__(self, name, frame_source, activation_vote, deactivation_vote,
+                 motion_gate=None, tracker=None, tiler=None):
+        self.name = name
+        self.frame_source = frame_source
+        self.frame_grabber = None
+        self.activation_vote = activation_vote
+        self.deactivation_vote = deactivation_vote
+        self.motion_gate = motion_gate
+        self.tracker = tracker
+        self.tiler = tiler  # FrameTiler in tiled high-resolution mode
+
+        self.wants_privacy = False
+        self.last_detection_time = 0  # Start of the current run of multiple-people evidence
+        self.last_result = (0, [])
+        self.inferred = False  # Whether the model ran on the last processed frame
+        self.face_count = 0    # Face count of the last processed frame
+        self.raw_face_count = 0  # Detections of the last inference, before the tracker confirms them
+
+    def open(self, buffer_size):
+        """Opens the source; live or realtime sources get a latest-frame grabber thread"""
+        if not self.frame_source.open():
+            logger.error(f"Unable to open {self.frame_source.name}!")
+            return False
+
+        # Read frames on a dedicated thread so detection always sees the newest one.
+        # Unpaced playback is read synchronously so that every frame gets processed.
+        if self.frame_source.is_paced:
+            self.frame_grabber = FrameGrabber(self.frame_source, buffer_size)
+            self.frame_grabber.start()
+        return True
+
+    def close(self):
+        if self.frame_grabber:
+            self.frame_grabber.stop()
+            self.frame_grabber = None
+        self.frame_source.release()
+
+    def reset(self):
+        """Forgets the scene history after a pause; wants_privacy is kept until the votes decide again"""
+        self.activation_vote.reset()
+        self.deactivation_vote.reset()
+        self.last_detection_time = 0
+        self.last_result = (0, [])
+        self.raw_face_count = 0
+        if self.motion_gate is not None:
+            self.motion_gate.reset()
+        if self.tracker is not None:
+            self.tracker.reset()
+        if self.tiler is not None:
+            self.tiler.reset()
+
+    def read(self):
+        """Returns (ret, frame, timestamp) for the next frame to process"""
+        if self.frame_grabber:
+            ret, frame, timestamp = self.frame_grabber.read()
+        else:
+            ret, frame = self.frame_source.read()
+            timestamp = time.monotonic()
+        return ret, frame, timestamp
+
+    @property
+    def exhausted(self):
+        return self.frame_source.exhausted
+
+    @property
+    def frames_dropped(self):
+        """Number of captured frames that were never processed"""
+        return self.frame_grabber.frames_dropped if self.frame_grabber else 0
+
+    def state(self):
+        """Scheduling state of this camera alone"""
+        if self.wants_privacy:
+            return STATE_ACTIVE
+        if self.last_detection_time:
+            return STATE_CONFIRMING
+        return STATE_IDLE
+
+    def can_skip_inference(self):
+        """Whether the motion gate may skip this camera's model run
+
+        Only while idle, never while the last inference saw more than one raw
+        detection, and never while the tracker still has unconfirmed tracks: a
+        new face needs fresh inferences to reach min_hits, and until then the
+        confirmed count cannot report it. Possible multiple people therefore
+        always get fresh inferences.
+        """
+        if self.motion_gate is None or self.state() != STATE_IDLE or self.raw_face_count > 1:
+            return False
+        return self.tracker is None or not self.tracker.has_tentative()
+
+    def vote(self, face_count, now):
+        """Feeds a face count into the privacy votes, returns True when wants_privacy changed
+
+        A single missed detection no longer restarts the privacy_delay countdown and
+        a single low count no longer ends privacy; each transition needs its vote's
+        share of the window.
+        """
+        multiple_people = face_count > 1
+
+        if not self.wants_privacy:
+            self.activation_vote.add(now, multiple_people)
+
+            # Track when the current run of multiple-people evidence began
+            if multiple_people and self.last_detection_time == 0:
+                self.last_detection_time = now
+            elif self.last_detection_time and self.activation_vote.fraction(now) == 0:
+                self.last_detection_time = 0
+
+            if self.activation_vote.passed(now):
+                self.wants_privacy = True
+                self.last_detection_time = 0
+                self.deactivation_vote.reset()
+                return True
+        else:
+            self.deactivation_vote.add(now, not multiple_people)
+
+            if self.deactivation_vote.passed(now):
+                self.wants_privacy = False
+                self.activation_vote.reset()
+                return True
+        return False
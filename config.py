@@ -7,12 +7,23 @@
 # 臉部偵測設定
 DETECTION_THRESHOLD = 0.8  # 臉部偵測信心度閾值 (0.0-1.0)
 PRIVACY_DELAY = 2.0        # 偵測到多人後延遲啟動隱私模式的時間 (秒)
+POSTPROCESSOR = "components"  # 熱圖後處理方式: components (連通區域), grid (網格搜尋)
+PRIVACY_ACTIVATION_RATIO = 0.8     # 啟動投票: 觀察視窗 (PRIVACY_DELAY / 比例) 內偵測到多人的時間比例
+PRIVACY_DEACTIVATION_WINDOW = 1.5  # 解除投票的觀察視窗 (秒)
+PRIVACY_DEACTIVATION_RATIO = 0.8   # 解除投票: 觀察視窗內只有一人或無人的時間比例
 
 # 攝影機設定
 CAMERA_INDEX = 0           # 攝影機索引 (通常 0 是預設攝影機)
+CAMERA_INDICES = []        # 同時監控的多個攝影機索引，例如 [0, 1]；空白時只使用 CAMERA_INDEX
 CAMERA_WIDTH = 640         # 攝影機解析度寬度
 CAMERA_HEIGHT = 480        # 攝影機解析度高度
 CAMERA_FPS = 60           # 攝影機 FPS
+CAPTURE_BUFFER_SIZE = 2    # 擷取執行緒環形緩衝區大小 (只保留最新的影格)
+
+# 影像來源設定
+FRAME_SOURCE = "camera"    # 影像來源: camera, video, images, synthetic
+FRAME_SOURCE_PATH = ""     # video 的影片檔路徑或 images 的圖片資料夾路徑
+FRAME_PACING = "realtime"  # realtime: 依來源 FPS 播放; fast: 盡可能快速處理 (基準測試用)
 
 # 隱私保護應用程式設定
 PRIVACY_APPS = {
@@ -25,6 +36,11 @@ PRIVACY_APPS = {
         "name": "Microsoft Edge", 
         "command": "msedge.exe",
         "fallback_path": ""
+    },
+    "linux": {  # Linux
+        "name": "Firefox",
+        "command": "firefox",
+        "fallback_path": ""
     }
 }
 
@@ -37,6 +53,10 @@ PRIVACY_APP_FALLBACK = {
     "win32": {
         "name": "Notepad",
         "command": "notepad.exe"
+    },
+    "linux": {
+        "name": "xdg-open",
+        "command": "xdg-open about:blank"
     }
 }
 
@@ -44,15 +64,66 @@ PRIVACY_APP_FALLBACK = {
 PRIVACY_APP_CUSTOM_PATH = ""
 
 # 系統設定
-DETECTION_INTERVAL = 0.1  # 偵測間隔 (秒)
+DETECTION_INTERVAL = 0.2  # 偵測間隔 (秒)，無人或只有一人時使用
+DETECTION_INTERVAL_CONFIRM = 0.05  # 偵測到多人、等待 PRIVACY_DELAY 確認期間的偵測間隔 (秒)
+DETECTION_INTERVAL_ACTIVE = 0.1    # 隱私模式啟動中的偵測間隔 (秒)
 LOG_LEVEL = 'INFO'        # 日誌等級 (DEBUG, INFO, WARNING, ERROR)
+LOG_FILE = "watch_out.log"  # 日誌檔案 (超過 MAX_LOG_SIZE_MB 時輪替，留空只輸出到終端機)
+LOG_BACKUP_COUNT = 3        # 保留的舊日誌檔案數量
+LOG_SUMMARY_INTERVAL = 60   # 偵測摘要 (畫面數、FPS、人數分布) 的記錄間隔 (秒，0 停用)
+LOG_COUNT_HOLD = 1.0        # 偵測人數需維持多久才記錄狀態行 (秒)，隱私模式切換一律立即記錄
+METRICS_ENABLED = False     # 是否記錄各階段延遲與計數 (--profile 時自動啟用)
+METRICS_PORT = 0            # 本機 metrics HTTP 端點埠號 (僅綁定 127.0.0.1，0 停用)
+CONTROL_SOCKET_PATH = "~/.watch_out.sock"  # 背景模式 (--daemon) 的控制 socket 路徑
+CONFIG_RELOAD_INTERVAL = 1.0  # 檢查 privacy_guard_config.json 是否變更的間隔 (秒)，變更會在執行中套用 (0 停用)
+
+# 動態偵測設定 (畫面靜止時略過模型推論)
+MOTION_GATE_ENABLED = True   # 是否啟用畫面變化偵測
+MOTION_THRESHOLD = 0.02      # 畫面變化閾值 (平均像素差異比例 0.0-1.0)
+MOTION_MAX_INTERVAL = 2.0    # 畫面靜止時最長多久仍強制推論一次 (秒)
+
+# 高解析度分塊偵測設定 (偵測遠處的人)
+TILED_DETECTION_ENABLED = False  # 是否以較高解析度擷取，並在重疊的分塊上執行模型
+TILED_CAMERA_WIDTH = 1280        # 分塊模式的攝影機解析度寬度
+TILED_CAMERA_HEIGHT = 960        # 分塊模式的攝影機解析度高度
+TILE_COLUMNS = 2                 # 分塊欄數
+TILE_ROWS = 2                    # 分塊列數
+TILE_OVERLAP = 0.15              # 相鄰分塊重疊比例 (0.0-0.5)
+TILES_PER_FRAME = 1              # 完整掃描之間每個畫面最多執行的分塊數 (每畫面成本，0 = 只做完整掃描)
+TILED_FULL_PASS_INTERVAL = 2.0   # 所有分塊一起執行的完整掃描間隔 (秒)
+
+# 臉部追蹤設定
+TRACKER_ENABLED = True        # 是否啟用臉部追蹤 (以確認過的追蹤目標計算人數)
+TRACKER_IOU_THRESHOLD = 0.3   # 偵測框與追蹤目標配對的最低 IoU
+TRACKER_MIN_HITS = 2          # 追蹤目標需被偵測到幾次才算確認
+TRACKER_MAX_MISSES = 3        # 追蹤目標連續幾次推論未偵測到後移除
 
 # 進階設定
 ENABLE_FACE_PREVIEW = True   # 是否顯示臉部偵測預覽視窗 (除錯用)
+PREVIEW_FPS = 15             # 預覽視窗最高更新率 (FPS)，與偵測頻率無關
 SAVE_DETECTION_LOG = True    # 是否儲存偵測記錄
 MAX_LOG_SIZE_MB = 10        # 最大日誌檔案大小 (MB)
+DETECTION_LOG_DIR = "detection_logs"  # 偵測記錄目錄 (每個畫面一筆 64 位元組的二進位記錄)
+DETECTION_LOG_MAX_FILES = 100         # 保留的偵測記錄檔案數量 (每個檔案最大 MAX_LOG_SIZE_MB)
 
 # 模型設定
 MODEL_PATH = "model.onnx/model.onnx"  # ONNX 模型路徑
+MODEL_VARIANTS = {"default": MODEL_PATH}  # 可供自動調校選擇的模型版本 (名稱: 路徑)，第一個為精確度基準，例如 int8 量化或低解析度匯出版本
+EXECUTION_PROVIDERS = ['QNNExecutionProvider', 'CPUExecutionProvider']  # 依優先順序排列 (啟用自動調校時為候選清單)
+WARMUP_RUNS = 3  # 啟動時以全零輸入預先執行的推論次數，讓第一個真實畫面不必承擔初始化延遲 (0 停用)
+AUTOTUNE_ENABLED = False              # 是否在每台機器上自動選擇最快且精確度合格的模型版本與執行提供者 (結果會快取，需要校正資料)
+AUTOTUNE_CALIBRATION_PATH = "calibration"  # 校正影像資料夾或影片 (找不到時只比較基準模型在各執行提供者上的速度)
+AUTOTUNE_FRAMES = 30                  # 每個候選組合測試的畫面數
+AUTOTUNE_MIN_AGREEMENT = 0.95         # 與基準模型偵測人數一致的最低比例 (精確度門檻)
+AUTOTUNE_MIN_FACE_FRAMES = 0.5        # 基準模型至少要在此比例的校正畫面中偵測到人臉，精確度門檻才有意義
+
+# ONNX Runtime 設定
+ORT_GRAPH_OPTIMIZATION_LEVEL = "all"  # 圖最佳化等級: disable, basic, extended, all
+ORT_INTRA_OP_THREADS = 0              # 運算子內執行緒數 (0 = 由 ONNX Runtime 決定)
+ORT_INTER_OP_THREADS = 0              # 運算子間執行緒數 (0 = 由 ONNX Runtime 決定)
+ORT_EXECUTION_MODE = "sequential"     # 執行模式: sequential, parallel
+ORT_ENABLE_MEM_PATTERN = True         # 是否啟用記憶體配置模式最佳化
+ORT_ENABLE_CPU_MEM_ARENA = True       # 是否啟用 CPU 記憶體池
+MODEL_CACHE_DIR = ".model_cache"      # 最佳化模型 / QNN context 快取目錄 (留空停用)
 
 
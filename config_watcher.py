@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Config watcher - Watch Out
+Notices changes to the user configuration file with a throttled stat() call
+"""
+
+import os
+import time
+
+
+def _signature(path):
+    """(mtime, size) of the file, None when it does not exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class ConfigWatcher:
+    """Reports when the file's modification time or size changed since the last check
+
+    Checks cost one stat() at most every check_interval seconds, so it can be
+    polled from the detection loop on every frame. An interval of 0 disables it.
+    """
+
+    def __init__(self, path, check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._signature = _signature(path)
+        self._checked_at = time.monotonic()
+
+    def changed(self, now=None):
+        if self.check_interval <= 0:
+            return False
+        now = time.monotonic() if now is None else now
+        if now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+
+        signature = _signature(self.path)
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        return True
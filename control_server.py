@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Control server - Watch Out
+Local Unix domain socket that lets other processes query and control a running instance
+
+Protocol: one command per line (e.g. "status", "pause", "privacy on"), one JSON
+object per line back. Try it with `python main.py --control status`.
+"""
+
+import json
+import os
+import socket
+import stat
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_LINE = 1024
+
+
+def socket_supported():
+    return hasattr(socket, "AF_UNIX")
+
+
+class ControlServer:
+    """Accepts connections on a Unix socket and hands each command line to `handle_command`
+
+    handle_command(command, args) returns a JSON-serializable dict. The socket
+    file is created with owner-only permissions.
+    """
+
+    def __init__(self, path, handle_command):
+        self.path = os.path.expanduser(path)
+        self.handle_command = handle_command
+        self._socket = None
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        if not socket_supported():
+            logger.error("Unix domain sockets are not supported on this platform")
+            return False
+        if os.path.exists(self.path):
+            if _is_listening(self.path):
+                logger.error(f"Another instance is already listening on {self.path}")
+                return False
+            os.remove(self.path)  # Stale socket file from a previous run
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            old_umask = os.umask(0o177)
+            try:
+                server.bind(self.path)
+            finally:
+                os.umask(old_umask)
+            os.chmod(self.path, stat.S_IRUSR | stat.S_IWUSR)
+            server.listen(4)
+        except OSError as e:
+            server.close()
+            logger.error(f"Unable to open control socket {self.path}: {e}")
+            return False
+
+        server.settimeout(0.5)  # So stop() is noticed without a connection
+        self._socket = server
+        self._running = True
+        self._thread = threading.Thread(target=self._accept_loop, name="ControlServer", daemon=True)
+        self._thread.start()
+        logger.info(f"Control socket: {self.path}")
+        return True
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(2.0)
+            self._thread = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                connection, _ = self._socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            threading.Thread(target=self._serve, args=(connection,), name="ControlClient", daemon=True).start()
+
+    def _serve(self, connection):
+        with connection, connection.makefile('rwb') as stream:
+            for line in stream:
+                if len(line) > MAX_LINE:
+                    reply = {'ok': False, 'error': "command too long"}
+                else:
+                    parts = line.decode('utf-8', 'replace').split()
+                    if not parts:
+                        continue
+                    try:
+                        reply = self.handle_command(parts[0].lower(), parts[1:])
+                    except Exception as e:
+                        logger.warning(f"Control command '{line.strip()}' failed: {e}")
+                        reply = {'ok': False, 'error': str(e)}
+                try:
+                    stream.write(json.dumps(reply).encode('utf-8') + b"\n")
+                    stream.flush()
+                except OSError:
+                    break
+
+
+def _is_listening(path):
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def send_command(path, command, timeout=5.0):
+    """Client side: sends one command line, returns the decoded reply"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(os.path.expanduser(path))
+        client.sendall(command.strip().encode('utf-8') + b"\n")
+        with client.makefile('rb') as stream:
+            return json.loads(stream.readline())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Detection recorder - Watch Out
+Appends one fixed-size binary record per processed frame to size-rotated files,
+and memory-maps them back as NumPy arrays for tuning
+"""
+
+import os
+import glob
+import time
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"WODL"
+VERSION = 1
+HEADER_SIZE = 16  # magic, version (u2), record size (u2), reserved
+MAX_FACES = 4     # Boxes stored per record, face_count is exact even when more were detected
+
+FLAG_PRIVACY = 1   # Privacy mode was on
+FLAG_INFERRED = 2  # The model ran on this frame (otherwise the motion gate reused the last result)
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),     # Unix time
+    ('camera', 'u1'),         # Channel index
+    ('flags', 'u1'),          # FLAG_* bits
+    ('face_count', '<u2'),
+    ('capture_ms', '<f4'),    # Frame age when detection started
+    ('detect_ms', '<f4'),     # Preprocessing, inference and post-processing
+    ('update_ms', '<f4'),     # Privacy vote update
+    ('bboxes', '<i2', (MAX_FACES, 4)),
+    ('confidences', '<f2', (MAX_FACES,)),
+])  # 64 bytes
+
+
+def _header():
+    header = MAGIC + np.array([VERSION, RECORD_DTYPE.itemsize], dtype='<u2').tobytes()
+    return header.ljust(HEADER_SIZE, b"\0")
+
+
+class DetectionRecorder:
+    """Buffers records in memory and appends them to the current file in one write
+
+    Files are rotated once they would exceed max_file_mb, and the oldest files
+    are deleted so at most max_files are kept. Write errors disable recording
+    instead of interrupting detection.
+    """
+
+    def __init__(self, directory, max_file_mb=10, max_files=100, buffer_records=256, flush_interval=5.0):
+        self.directory = directory
+        self.max_file_bytes = max(int(max_file_mb * 1024 * 1024), HEADER_SIZE + RECORD_DTYPE.itemsize)
+        self.max_files = max_files
+        self.flush_interval = flush_interval
+        self._buffer = np.zeros(buffer_records, dtype=RECORD_DTYPE)
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._file = None
+        self._file_size = 0
+        self.enabled = True
+        self.records_written = 0
+
+    def record(self, camera, face_count, faces, privacy, inferred,
+               capture_ms=0.0, detect_ms=0.0, update_ms=0.0, timestamp=None):
+        """Adds one frame's result, faces are detection dicts with 'bbox' and 'confidence'"""
+        if not self.enabled:
+            return
+        row = self._buffer[self._pending]
+        row['timestamp'] = time.time() if timestamp is None else timestamp
+        row['camera'] = camera
+        row['flags'] = (FLAG_PRIVACY if privacy else 0) | (FLAG_INFERRED if inferred else 0)
+        row['face_count'] = min(face_count, 0xFFFF)
+        row['capture_ms'] = capture_ms
+        row['detect_ms'] = detect_ms
+        row['update_ms'] = update_ms
+        boxes = row['bboxes']
+        confidences = row['confidences']
+        boxes[:] = 0
+        confidences[:] = 0
+        for i, face in enumerate(faces[:MAX_FACES]):
+            boxes[i] = np.clip(face['bbox'], -0x8000, 0x7FFF)
+            confidences[i] = face['confidence']
+        self._pending += 1
+
+        if self._pending == len(self._buffer) or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered records to disk"""
+        self._last_flush = time.monotonic()
+        if not self._pending or not self.enabled:
+            return
+        data = self._buffer[:self._pending].tobytes()
+        self._pending = 0
+        try:
+            if self._file is None or self._file_size + len(data) > self.max_file_bytes:
+                self._rotate()
+            self._file.write(data)
+            self._file.flush()
+            self._file_size += len(data)
+            self.records_written += len(data) // RECORD_DTYPE.itemsize
+        except OSError as e:
+            logger.warning(f"Detection log disabled, write failed: {e}")
+            self.enabled = False
+            self._close_file()
+
+    def close(self):
+        self.flush()
+        self._close_file()
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def _rotate(self):
+        self._close_file()
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.directory, f"detections-{stamp}.bin")
+        suffix = 1
+        while os.path.exists(path):
+            path = os.path.join(self.directory, f"detections-{stamp}-{suffix}.bin")
+            suffix += 1
+        self._file = open(path, 'wb')
+        self._file.write(_header())
+        self._file_size = HEADER_SIZE
+        logger.debug(f"Detection log file: {path}")
+
+        files = log_files(self.directory)
+        for old in files[:max(0, len(files) - self.max_files)]:
+            try:
+                os.remove(old)
+            except OSError as e:
+                logger.warning(f"Unable to remove old detection log {old}: {e}")
+
+
+def log_files(directory):
+    """Detection log files in chronological order"""
+    return sorted(glob.glob(os.path.join(directory, "detections-*.bin")), key=os.path.getmtime)
+
+
+def open_detection_log(path):
+    """Memory-maps one log file as a read-only structured array (a partly written last record is ignored)"""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or header[:4] != MAGIC:
+        raise ValueError(f"{path} is not a detection log")
+    version, record_size = np.frombuffer(header[4:8], dtype='<u2')
+    if version != VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path} has unsupported format version {version}")
+    count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+
+
+def load_detection_log(path):
+    """Loads a log file, or every log file in a directory, as one structured array"""
+    if os.path.isdir(path):
+        parts = [open_detection_log(p) for p in log_files(path)]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=RECORD_DTYPE)
+    return open_detection_log(path)
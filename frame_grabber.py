@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Frame grabber - Watch Out
+Reads frames on a dedicated thread so the detector always gets the newest frame
+"""
+
+import threading
+import time
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class FrameGrabber:
+    """Background capture thread with a small ring buffer of the latest frames"""
+
+    def __init__(self, source, buffer_size=2):
+        self.source = source
+        self.buffer_size = max(1, int(buffer_size))
+        self._buffer = deque(maxlen=self.buffer_size)  # (frame_id, timestamp, frame)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._last_frame_id = 0
+        self._last_consumed_id = 0
+
+        # Statistics
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.read_failures = 0
+
+    def start(self):
+        """Starts the capture thread"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="FrameGrabber", daemon=True)
+        self._thread.start()
+        logger.debug("Frame grabber started")
+
+    def stop(self, timeout=1.0):
+        """Stops the capture thread"""
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        logger.debug(f"Frame grabber stopped (captured: {self.frames_captured}, dropped: {self.frames_dropped})")
+
+    @property
+    def is_running(self):
+        return self._running
+
+    def _capture_loop(self):
+        """Continuously drains the source so the driver buffer never fills up"""
+        while self._running:
+            try:
+                ret, frame = self.source.read()
+            except Exception as e:
+                logger.warning(f"Frame capture failed: {e}")
+                ret, frame = False, None
+
+            if not ret:
+                if getattr(self.source, 'exhausted', False):
+                    # Finite source ran out, let readers drain what is left
+                    with self._cond:
+                        self._running = False
+                        self._cond.notify_all()
+                    break
+                self.read_failures += 1
+                # Avoid spinning when the device is gone
+                time.sleep(0.01)
+                continue
+
+            timestamp = time.monotonic()
+            with self._cond:
+                self._last_frame_id += 1
+                self._buffer.append((self._last_frame_id, timestamp, frame))
+                self.frames_captured += 1
+                self._cond.notify_all()
+
+    def read(self, timeout=1.0):
+        """Returns (ret, frame, timestamp) for the newest frame not yet consumed
+
+        Frames that were overwritten before being consumed are counted as dropped.
+        The timestamp comes from time.monotonic() at capture time.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._running and self._last_frame_id <= self._last_consumed_id:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False, None, None
+                self._cond.wait(remaining)
+
+            if not self._buffer or self._last_frame_id <= self._last_consumed_id:
+                return False, None, None
+
+            frame_id, timestamp, frame = self._buffer[-1]
+            self.frames_dropped += frame_id - self._last_consumed_id - 1
+            self._last_consumed_id = frame_id
+
+        return True, frame, timestamp
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Frame sources - Watch Out
+Live cameras, video files, image folders and synthetic frames behind one interface
+"""
+
+import os
+import time
+import logging
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PACING_REALTIME = "realtime"  # Deliver frames at the source frame rate
+PACING_FAST = "fast"          # Deliver frames as fast as the consumer reads them
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+
+
+class FrameSource:
+    """Base class for everything PrivacyGuard can read frames from
+
+    Subclasses implement _open(), _read() and _release(). read() returns
+    (ret, frame) like cv2.VideoCapture.read(); once a finite source runs out
+    of frames `exhausted` is set and read() keeps returning (False, None).
+    """
+
+    name = "source"
+    is_live = False
+
+    def __init__(self, fps=30.0, pacing=PACING_REALTIME, loop=False):
+        if pacing not in (PACING_REALTIME, PACING_FAST):
+            raise ValueError(f"Unknown pacing mode: {pacing}")
+        self.fps = fps
+        self.pacing = pacing
+        self.loop = loop
+        self.exhausted = False
+        self.frames_read = 0
+        self._opened = False
+        self._start_time = None
+
+    @property
+    def is_paced(self):
+        """True when frames arrive on a clock (live camera or realtime playback)"""
+        return self.is_live or self.pacing == PACING_REALTIME
+
+    def open(self):
+        """Opens the source, returns True on success"""
+        try:
+            self._opened = self._open()
+        except Exception as e:
+            logger.error(f"Failed to open {self.name}: {e}")
+            self._opened = False
+        self.exhausted = False
+        self.frames_read = 0
+        self._start_time = None
+        return self._opened
+
+    def is_opened(self):
+        return self._opened
+
+    def read(self):
+        """Reads the next frame, returns (ret, frame)"""
+        if not self._opened or self.exhausted:
+            return False, None
+
+        self._wait_for_next_frame()
+        ret, frame = self._read()
+        if not ret and not self.is_live:
+            if self.loop and self.frames_read > 0 and self._rewind():
+                ret, frame = self._read()
+            if not ret:
+                self.exhausted = True
+                logger.info(f"{self.name} exhausted after {self.frames_read} frames")
+                return False, None
+
+        if ret:
+            self.frames_read += 1
+        return ret, frame
+
+    def release(self):
+        """Releases the underlying resources"""
+        if self._opened:
+            self._release()
+        self._opened = False
+
+    def _wait_for_next_frame(self):
+        """Sleeps until the next frame is due when playing back recorded footage in real time"""
+        if self.is_live or self.pacing != PACING_REALTIME or not self.fps:
+            return
+        now = time.monotonic()
+        if self._start_time is None:
+            self._start_time = now
+            return
+        due = self._start_time + self.frames_read / self.fps
+        if due > now:
+            time.sleep(due - now)
+
+    def _open(self):
+        raise NotImplementedError
+
+    def _read(self):
+        raise NotImplementedError
+
+    def _rewind(self):
+        return False
+
+    def _release(self):
+        pass
+
+
+class CameraSource(FrameSource):
+    """Live camera through cv2.VideoCapture"""
+
+    is_live = True
+
+    def __init__(self, camera_index=0, width=640, height=480, fps=30.0):
+        super().__init__(fps=fps, pacing=PACING_REALTIME)
+        self.camera_index = camera_index
+        self.width = width
+        self.height = height
+        self.name = f"camera {camera_index}"
+        self.cap = None
+
+    def _open(self):
+        self.cap = cv2.VideoCapture(self.camera_index)
+        if not self.cap.isOpened():
+            return False
+
+        # Set camera parameters
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+        # Keep the driver queue short; the grabber thread drains it anyway
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return True
+
+    def _read(self):
+        return self.cap.read()
+
+    def _release(self):
+        self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    """Recorded footage through cv2.VideoCapture"""
+
+    def __init__(self, path, pacing=PACING_REALTIME, loop=False, fps=None):
+        super().__init__(fps=fps, pacing=pacing, loop=loop)
+        self.path = path
+        self.name = f"video {os.path.basename(path)}"
+        self.cap = None
+
+    def _open(self):
+        if not os.path.isfile(self.path):
+            logger.error(f"Video file not found: {self.path}")
+            return False
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            return False
+        if not self.fps:
+            self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        return True
+
+    def _read(self):
+        return self.cap.read()
+
+    def _rewind(self):
+        return self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def _release(self):
+        self.cap.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """A folder of still images, read in sorted file name order"""
+
+    def __init__(self, path, pacing=PACING_REALTIME, loop=False, fps=30.0):
+        super().__init__(fps=fps, pacing=pacing, loop=loop)
+        self.path = path
+        self.name = f"images {path}"
+        self.files = []
+        self._index = 0
+
+    def _open(self):
+        if not os.path.isdir(self.path):
+            logger.error(f"Image directory not found: {self.path}")
+            return False
+        self.files = sorted(
+            os.path.join(self.path, f) for f in os.listdir(self.path)
+            if f.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self._index = 0
+        if not self.files:
+            logger.error(f"No images found in {self.path}")
+            return False
+        return True
+
+    def _read(self):
+        while self._index < len(self.files):
+            path = self.files[self._index]
+            self._index += 1
+            frame = cv2.imread(path, cv2.IMREAD_COLOR)
+            if frame is not None:
+                return True, frame
+            logger.warning(f"Skipping unreadable image: {path}")
+        return False, None
+
+    def _rewind(self):
+        self._index = 0
+        return True
+
+
+class SyntheticSource(FrameSource):
+    """Deterministic generated frames with a few moving bright blobs
+
+    Useful for throughput and latency numbers on machines without a camera;
+    the same seed always yields the same frame sequence.
+    """
+
+    def __init__(self, width=640, height=480, num_frames=300, num_blobs=2,
+                 pacing=PACING_REALTIME, loop=False, fps=30.0, seed=0):
+        super().__init__(fps=fps, pacing=pacing, loop=loop)
+        self.width = width
+        self.height = height
+        self.num_frames = num_frames
+        self.num_blobs = num_blobs
+        self.seed = seed
+        self.name = "synthetic"
+        self._index = 0
+        self._background = None
+        self._blobs = None
+
+    def _open(self):
+        rng = np.random.default_rng(self.seed)
+        self._background = rng.integers(40, 90, (self.height, self.width, 3), dtype=np.uint8)
+        # Each blob: start position, velocity and radius
+        self._blobs = [
+            (rng.uniform(0.2, 0.8, 2) * (self.width, self.height),
+             rng.uniform(-3.0, 3.0, 2),
+             int(rng.uniform(0.08, 0.15) * self.height))
+            for _ in range(self.num_blobs)
+        ]
+        self._index = 0
+        return True
+
+    def _read(self):
+        if self.num_frames and self._index >= self.num_frames:
+            return False, None
+
+        frame = self._background.copy()
+        for start, velocity, radius in self._blobs:
+            cx, cy = start + velocity * self._index
+            cx, cy = _bounce(cx, self.width), _bounce(cy, self.height)
+            cv2.ellipse(frame, (cx, cy), (int(radius * 0.8), radius), 0, 0, 360, (200, 190, 180), -1)
+            cv2.circle(frame, (cx - radius // 3, cy - radius // 4), max(2, radius // 8), (30, 30, 30), -1)
+            cv2.circle(frame, (cx + radius // 3, cy - radius // 4), max(2, radius // 8), (30, 30, 30), -1)
+        self._index += 1
+        return True, frame
+
+    def _rewind(self):
+        self._index = 0
+        return True
+
+
+def _bounce(value, limit):
+    """Folds a position back into [0, limit) so blobs bounce off the frame edges"""
+    period = 2 * limit
+    value = value % period
+    return int(period - value - 1 if value >= limit else value)
+
+
+def create_frame_source(kind, camera_index=0, path="", width=640, height=480, fps=30.0,
+                        pacing=PACING_REALTIME, loop=False):
+    """Builds a frame source from its configuration name"""
+    if kind == "camera":
+        return CameraSource(camera_index, width, height, fps)
+    if kind == "video":
+        return VideoFileSource(path, pacing=pacing, loop=loop)
+    if kind == "images":
+        return ImageDirectorySource(path, pacing=pacing, loop=loop, fps=fps)
+    if kind == "synthetic":
+        return SyntheticSource(width, height, pacing=pacing, loop=loop, fps=fps)
+    raise ValueError(f"Unknown frame source: {kind}")
+
+
+def load_frames(path, count, width, height, loop=False):
+    """Frames preloaded into memory and resized to width x height
+
+    Reads an image directory or video file, or synthetic frames when path is
+    empty. Raises RuntimeError when no frames can be read.
+    """
+    if not path:
+        source = SyntheticSource(width, height, num_frames=count, pacing=PACING_FAST)
+    else:
+        kind = "images" if os.path.isdir(path) else "video"
+        source = create_frame_source(kind, path=path, pacing=PACING_FAST, loop=loop)
+    if not source.open():
+        raise RuntimeError(f"Unable to open {source.name}")
+    frames = []
+    try:
+        while len(frames) < count:
+            ret, frame = source.read()
+            if not ret:
+                break
+            if frame.shape[:2] != (height, width):
+                frame = cv2.resize(frame, (width, height))
+            frames.append(frame)
+    finally:
+        source.release()
+    if not frames:
+        raise RuntimeError(f"No frames in {source.name}")
+    return frames
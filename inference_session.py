@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Inference session - Watch Out
+Builds ONNX Runtime sessions from configurable SessionOptions, keeps an on-disk
+cache of the optimized graph (or the QNN context binary) keyed by model hash and provider,
+and runs inference through IOBinding with persistent buffers
+
+onnxruntime is imported on first use, so importing this module is cheap.
+"""
+
+import hashlib
+import logging
+import os
+import platform
+import shutil
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+QNN_PROVIDER = 'QNNExecutionProvider'
+CPU_PROVIDER = 'CPUExecutionProvider'
+
+# Setting values -> ort.GraphOptimizationLevel / ort.ExecutionMode member names
+GRAPH_OPTIMIZATION_LEVELS = {
+    'disable': 'ORT_DISABLE_ALL',
+    'basic': 'ORT_ENABLE_BASIC',
+    'extended': 'ORT_ENABLE_EXTENDED',
+    'all': 'ORT_ENABLE_ALL',
+}
+
+EXECUTION_MODES = {
+    'sequential': 'ORT_SEQUENTIAL',
+    'parallel': 'ORT_PARALLEL',
+}
+
+CACHED_MODEL_NAME = "model.onnx"
+CACHED_DATA_NAME = "model.data"
+
+
+def build_session_options(settings):
+    """Creates ort.SessionOptions from a settings dict
+
+    Recognised keys: graph_optimization_level, intra_op_num_threads,
+    inter_op_num_threads, execution_mode, enable_mem_pattern, enable_cpu_mem_arena.
+    Thread counts of 0 leave the choice to ONNX Runtime.
+    """
+    import onnxruntime as ort
+    options = ort.SessionOptions()
+
+    level = settings.get('graph_optimization_level', 'all')
+    if level not in GRAPH_OPTIMIZATION_LEVELS:
+        raise ValueError(f"Unknown graph optimization level: {level}")
+    options.graph_optimization_level = getattr(ort.GraphOptimizationLevel, GRAPH_OPTIMIZATION_LEVELS[level])
+
+    mode = settings.get('execution_mode', 'sequential')
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode: {mode}")
+    options.execution_mode = getattr(ort.ExecutionMode, EXECUTION_MODES[mode])
+
+    options.intra_op_num_threads = int(settings.get('intra_op_num_threads', 0))
+    options.inter_op_num_threads = int(settings.get('inter_op_num_threads', 0))
+    options.enable_mem_pattern = bool(settings.get('enable_mem_pattern', True))
+    options.enable_cpu_mem_arena = bool(settings.get('enable_cpu_mem_arena', True))
+    return options
+
+
+def model_fingerprint(model_path):
+    """Hashes the model file together with its external data files"""
+    digest = hashlib.sha256()
+    model_dir = os.path.dirname(os.path.abspath(model_path))
+    paths = [model_path] + sorted(
+        os.path.join(model_dir, f) for f in os.listdir(model_dir) if f.endswith('.data')
+    )
+    for path in paths:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(model_path, provider, settings):
+    """Cache entries are only valid for the same model, provider, ORT build, machine and optimization level"""
+    import onnxruntime as ort
+    parts = [
+        model_fingerprint(model_path),
+        provider,
+        ort.__version__,
+        platform.machine(),
+        platform.processor(),
+        str(settings.get('graph_optimization_level', 'all')),
+    ]
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()[:24]
+
+
+def resolve_providers(providers):
+    """Keeps the requested providers that this ONNX Runtime build offers, in priority order"""
+    import onnxruntime as ort
+    available = ort.get_available_providers()
+    resolved = [p for p in providers if p in available]
+    if CPU_PROVIDER not in resolved:
+        resolved.append(CPU_PROVIDER)
+    return resolved
+
+
+def create_session(model_path, providers, settings, cache_dir=""):
+    """Creates an InferenceSession, reusing or populating the on-disk cache when cache_dir is set"""
+    import onnxruntime as ort
+    providers = resolve_providers(providers)
+    if not cache_dir:
+        return ort.InferenceSession(model_path, build_session_options(settings), providers=providers)
+
+    primary = providers[0]
+    entry_dir = os.path.join(cache_dir, cache_key(model_path, primary, settings))
+    cached_model = os.path.join(entry_dir, CACHED_MODEL_NAME)
+
+    if os.path.exists(cached_model):
+        try:
+            session = _load_cached(cached_model, primary, providers, settings)
+            logger.info(f"Loaded optimized model from cache: {entry_dir}")
+            return session
+        except Exception as e:
+            logger.warning(f"Cached model is unusable, rebuilding: {e}")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+    return _build_and_cache(model_path, entry_dir, primary, providers, settings)
+
+
+def _load_cached(cached_model, primary, providers, settings):
+    import onnxruntime as ort
+    options = build_session_options(settings)
+    if primary != QNN_PROVIDER:
+        # The graph was optimized when it was cached, don't pay for it again
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+    return ort.InferenceSession(cached_model, options, providers=providers)
+
+
+def _build_and_cache(model_path, entry_dir, primary, providers, settings):
+    """Compiles the model once and writes the result next to the cache entry atomically"""
+    import onnxruntime as ort
+    tmp_dir = f"{entry_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir, exist_ok=True)
+    tmp_model = os.path.join(tmp_dir, CACHED_MODEL_NAME)
+
+    options = build_session_options(settings)
+    if primary == QNN_PROVIDER:
+        # Dump the compiled QNN context binary embedded in an EP context model
+        options.add_session_config_entry('ep.context_enable', '1')
+        options.add_session_config_entry('ep.context_embed_mode', '1')
+        options.add_session_config_entry('ep.context_file_path', tmp_model)
+    else:
+        options.optimized_model_filepath = tmp_model
+        options.add_session_config_entry('session.optimized_model_external_initializers_file_name', CACHED_DATA_NAME)
+        options.add_session_config_entry('session.optimized_model_external_initializers_min_size_in_bytes', '1024')
+
+    session = ort.InferenceSession(model_path, options, providers=providers)
+
+    try:
+        if os.path.exists(tmp_model):
+            os.replace(tmp_dir, entry_dir)
+            logger.info(f"Optimized model cached: {entry_dir}")
+        else:
+            logger.warning(f"{primary} did not produce a cacheable model")
+    except OSError as e:
+        # Another process may have populated the entry first
+        logger.debug(f"Could not store model cache entry: {e}")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return session
+
+
+ONNX_TO_NUMPY_TYPES = {
+    'tensor(uint8)': np.uint8,
+    'tensor(int8)': np.int8,
+    'tensor(uint16)': np.uint16,
+    'tensor(int16)': np.int16,
+    'tensor(int32)': np.int32,
+    'tensor(int64)': np.int64,
+    'tensor(float16)': np.float16,
+    'tensor(float)': np.float32,
+    'tensor(double)': np.float64,
+}
+
+
+class BoundInference:
+    """Runs a session through IOBinding with persistent input and output buffers
+
+    The input tensor is bound once (the preprocessor keeps writing into the same
+    array) and only the requested outputs are bound, each to a preallocated array
+    that is overwritten on every run. Callers must finish with the returned arrays
+    before the next run().
+    """
+
+    def __init__(self, session, input_tensor, output_names):
+        import onnxruntime as ort
+        self.session = session
+        self.input_name = session.get_inputs()[0].name
+        self.output_names = list(output_names)
+        self.binding = session.io_binding()
+        self.input_tensor = input_tensor
+        self.binding.bind_ortvalue_input(self.input_name, ort.OrtValue.ortvalue_from_numpy(input_tensor))
+
+        model_outputs = {out.name: out for out in session.get_outputs()}
+        unknown = [name for name in self.output_names if name not in model_outputs]
+        if unknown:
+            raise ValueError(f"Model has no outputs named {unknown}")
+
+        self.outputs = []
+        for name in self.output_names:
+            buffer = np.empty(_static_shape(model_outputs[name]), dtype=_numpy_type(model_outputs[name]))
+            self.binding.bind_ortvalue_output(name, ort.OrtValue.ortvalue_from_numpy(buffer))
+            self.outputs.append(buffer)
+
+        # session.run(None, ...) allocated every output on every frame; now nothing is
+        # allocated per frame and outputs nobody reads are never copied out at all
+        self.bytes_per_frame_before = sum(
+            int(np.prod(_static_shape(out))) * np.dtype(_numpy_type(out)).itemsize
+            for out in model_outputs.values()
+        )
+        self.bytes_saved_per_frame = self.bytes_per_frame_before
+        logger.info(f"IOBinding enabled for outputs {self.output_names}, "
+                    f"saving {self.bytes_saved_per_frame} bytes of output allocations per frame")
+
+    @staticmethod
+    def supports(session):
+        """IOBinding with preallocated buffers needs fully static input and output shapes"""
+        try:
+            for node in list(session.get_inputs()) + list(session.get_outputs()):
+                _static_shape(node)
+                _numpy_type(node)
+            return True
+        except ValueError:
+            return False
+
+    def run(self):
+        """Runs inference on the current contents of the bound input tensor"""
+        self.session.run_with_iobinding(self.binding)
+        return self.outputs
+
+
+def _static_shape(node):
+    shape = node.shape
+    if not all(isinstance(dim, int) and dim > 0 for dim in shape):
+        raise ValueError(f"{node.name} has a dynamic shape: {shape}")
+    return tuple(shape)
+
+
+def _numpy_type(node):
+    if node.type not in ONNX_TO_NUMPY_TYPES:
+        raise ValueError(f"{node.name} has an unsupported type: {node.type}")
+    return ONNX_TO_NUMPY_TYPES[node.type]
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Logging pipeline - Watch Out
+Non-blocking log output (QueueHandler -> QueueListener thread -> stderr and a rotating
+file) and periodic detection summaries that replace per-frame log lines
+"""
+
+import atexit
+import logging
+import queue
+import time
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_listener = None
+
+
+def parse_level(level):
+    """Accepts a level name ('INFO') or number, falls back to INFO"""
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).upper())
+    return value if isinstance(value, int) else logging.INFO
+
+
+def setup_logging(level='INFO', log_file="", max_size_mb=10, backup_count=3):
+    """Routes all records through a queue so callers never wait on terminal or disk I/O
+
+    A listener thread writes them to stderr and, if log_file is set, to a file
+    rotated at max_size_mb. Calling it again replaces the previous pipeline.
+    """
+    global _listener
+    stop_logging()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler()]
+    file_error = None
+    if log_file:
+        try:
+            handlers.append(RotatingFileHandler(log_file, maxBytes=int(max_size_mb * 1024 * 1024),
+                                                backupCount=backup_count, encoding='utf-8'))
+        except OSError as e:
+            file_error = e
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(parse_level(level))
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    if file_error:
+        logging.getLogger(__name__).warning(f"Unable to open log file {log_file}: {file_error}")
+    return _listener
+
+
+def stop_logging():
+    """Flushes the queued records and stops the listener thread"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(stop_logging)
+
+
+class PeriodicSummary:
+    """Aggregates per-frame face counts into one log line every `interval` seconds"""
+
+    def __init__(self, interval, max_bucket=3):
+        self.interval = interval
+        self.max_bucket = max_bucket  # Counts at or above this share one bucket ("3+")
+        self.reset()
+
+    def reset(self, now=None):
+        self.started = time.monotonic() if now is None else now
+        self.frames = 0
+        self.face_counts = Counter()
+
+    def record(self, face_count):
+        self.frames += 1
+        self.face_counts[min(face_count, self.max_bucket)] += 1
+
+    def due(self, now):
+        return self.interval > 0 and now - self.started >= self.interval
+
+    def report(self, now):
+        """Formats the summary since the last report and starts a new period"""
+        elapsed = max(now - self.started, 1e-9)
+        buckets = []
+        for count in range(self.max_bucket + 1):
+            label = f"{count}+" if count == self.max_bucket else str(count)
+            share = self.face_counts[count] / self.frames if self.frames else 0.0
+            buckets.append(f"{label}: {share:.0%}")
+        message = (f"Summary: {self.frames} frames in {elapsed:.1f} s ({self.frames / elapsed:.1f} FPS) | "
+                   f"Faces {', '.join(buckets)}")
+        self.reset(now)
+        return message
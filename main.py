@@ -6,71 +6,302 @@ Automatically blurs the screen when multiple people are detected to protect sens
 Uses Qualcomm AI Hub face detection model
 """
 
-import cv2
-import numpy as np
-import onnxruntime as ort
-import pyautogui
 import time
+IMPORT_START = time.perf_counter()  # --startup-profile: the import phase starts here
+
+import numpy as np
 import threading
 import sys
 import json
 import os
-from PIL import Image, ImageFilter
+import argparse
+import signal
+import copy
 import logging
-from config import *
-import subprocess
-import tempfile
+from config import (
+    DETECTION_THRESHOLD, PRIVACY_DELAY, POSTPROCESSOR, PRIVACY_ACTIVATION_RATIO,
+    PRIVACY_DEACTIVATION_WINDOW, PRIVACY_DEACTIVATION_RATIO,
+    CAMERA_INDEX, CAMERA_INDICES, CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_FPS, CAPTURE_BUFFER_SIZE,
+    FRAME_SOURCE, FRAME_SOURCE_PATH, FRAME_PACING,
+    PRIVACY_APPS, PRIVACY_APP_FALLBACK, PRIVACY_APP_CUSTOM_PATH,
+    DETECTION_INTERVAL, DETECTION_INTERVAL_CONFIRM, DETECTION_INTERVAL_ACTIVE,
+    LOG_LEVEL, LOG_FILE, LOG_BACKUP_COUNT, LOG_SUMMARY_INTERVAL, LOG_COUNT_HOLD, MAX_LOG_SIZE_MB,
+    METRICS_ENABLED, METRICS_PORT, CONTROL_SOCKET_PATH, CONFIG_RELOAD_INTERVAL,
+    MOTION_GATE_ENABLED, MOTION_THRESHOLD, MOTION_MAX_INTERVAL,
+    TILED_DETECTION_ENABLED, TILED_CAMERA_WIDTH, TILED_CAMERA_HEIGHT, TILE_COLUMNS, TILE_ROWS, TILE_OVERLAP,
+    TILES_PER_FRAME, TILED_FULL_PASS_INTERVAL,
+    TRACKER_ENABLED, TRACKER_IOU_THRESHOLD, TRACKER_MIN_HITS, TRACKER_MAX_MISSES,
+    ENABLE_FACE_PREVIEW, PREVIEW_FPS, SAVE_DETECTION_LOG, DETECTION_LOG_DIR, DETECTION_LOG_MAX_FILES,
+    MODEL_PATH, MODEL_VARIANTS, EXECUTION_PROVIDERS, MODEL_CACHE_DIR, WARMUP_RUNS,
+    AUTOTUNE_ENABLED, AUTOTUNE_CALIBRATION_PATH, AUTOTUNE_FRAMES, AUTOTUNE_MIN_AGREEMENT, AUTOTUNE_MIN_FACE_FRAMES,
+    ORT_GRAPH_OPTIMIZATION_LEVEL, ORT_INTRA_OP_THREADS, ORT_INTER_OP_THREADS, ORT_EXECUTION_MODE,
+    ORT_ENABLE_MEM_PATTERN, ORT_ENABLE_CPU_MEM_ARENA,
+)
+from frame_sources import create_frame_source
+from preprocessing import Preprocessor
+from inference_session import create_session, BoundInference
+from postprocessing import create_decoder
+from motion_gate import MotionGate
+from tracker import FaceTracker
+from tiling import FrameTiler
+from privacy_vote import TimeWindowVote
+from camera_channel import CameraChannel
+from privacy_actions import PrivacyActionExecutor, ACTION_ACTIVATE, ACTION_DEACTIVATE
+from privacy_apps import PrivacyAppManager, build_launch_plan
+from scheduler import DetectionScheduler, STATE_IDLE, STATE_CONFIRMING, STATE_ACTIVE
+from logging_pipeline import setup_logging, parse_level, PeriodicSummary
+from metrics import Metrics, StartupTimer
+from config_watcher import ConfigWatcher
+# onnxruntime is imported when the model loads; the preview, detection log, metrics
+# endpoint and control socket modules only when those features are switched on
 
-# Setup logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+IMPORTS_DONE = time.perf_counter()
+
+# Setup logging (records are written by a background listener, see logging_pipeline).
+# Only the terminal until main() knows whether this process is the guard or a --control client.
+setup_logging(LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
+CONFIG_FILE = "privacy_guard_config.json"
+
+# Settings that are applied together when privacy_guard_config.json changes while running
+RELOAD_GROUPS = {
+    'decoder': ('detection_threshold', 'postprocessor'),
+    'scheduler': ('detection_interval', 'detection_interval_confirm', 'detection_interval_active'),
+    'votes': ('privacy_delay', 'privacy_activation_ratio', 'privacy_deactivation_window',
+              'privacy_deactivation_ratio'),
+    'filters': ('motion_gate_enabled', 'motion_threshold', 'motion_max_interval', 'tracker_enabled',
+                'tracker_iou_threshold', 'tracker_min_hits', 'tracker_max_misses'),
+    'tiling': ('tile_columns', 'tile_rows', 'tile_overlap', 'tiles_per_frame', 'tiled_full_pass_interval'),
+    'launch_plan': ('privacy_apps', 'privacy_app_fallback', 'privacy_app_custom_path'),
+    'logging': ('log_level', 'log_file', 'max_log_size_mb', 'log_summary_interval', 'log_count_hold'),
+    'metrics': ('metrics_enabled',),
+    'preview': ('preview_fps',),
+    'watcher': ('config_reload_interval',),
+    'cameras': ('camera_index', 'camera_indices', 'frame_source_kind', 'frame_source_path', 'frame_pacing',
+                'tiled_detection_enabled', 'tiled_camera_width', 'tiled_camera_height'),
+    'model': ('execution_providers', 'ort_settings', 'model_cache_dir', 'model_variants', 'autotune_enabled',
+              'autotune_calibration_path', 'autotune_frames', 'autotune_min_agreement', 'autotune_min_face_frames'),
+    'restart': ('enable_face_preview', 'metrics_port', 'control_socket_path', 'save_detection_log',
+                'detection_log_dir', 'detection_log_max_files'),
+}
+# Every setting a reload swaps in: the groups above plus those read where they are used
+RELOAD_SETTINGS = tuple(name for names in RELOAD_GROUPS.values() for name in names) + ('warmup_runs',)
+
 class PrivacyGuard:
-    def __init__(self):
+    def __init__(self, frame_source=None):
         self.session = None
         self.input_name = None
         self.in_w = None
         self.in_h = None
-        self.cap = None
+        self.preprocessor = None
+        self.inference = None
+        self.output_names = None
+        self.decoder = None
+        self.batch_inputs = {}  # batch size -> (batch tensor, per-slot Preprocessors), dynamic batch models only
+        self.frame_source = frame_source  # 未指定時依設定建立 (預設為攝影機)
+        self.injected_source = frame_source  # Given by the caller, kept when the cameras are rebuilt
+        self.channels = []  # One CameraChannel per monitored camera
         self.is_running = False
         self.privacy_mode = False
-        self.last_detection_time = 0
-        self.app_process = None  # 用來追蹤應用程式進程
         
         # Load configuration
+        self.config_file = CONFIG_FILE
+        self.overrides = {}  # Settings given on the command line, kept across config reloads
         self.load_user_config()
+        self.scheduler = DetectionScheduler(self.detection_interval,
+                                            self.detection_interval_confirm,
+                                            self.detection_interval_active)
+        self.summary = PeriodicSummary(self.log_summary_interval)
+        self.metrics = Metrics(self.metrics_enabled or self.metrics_port > 0)
+        self.config_watcher = ConfigWatcher(self.config_file, self.config_reload_interval)
+        self.metrics.add_gauge('frames_dropped', lambda: self.frames_dropped)
+        self.metrics.add_gauge('privacy_mode', lambda: self.privacy_mode)
+        self.last_status = None  # (face counts, privacy mode) of the last status line written
+        self.pending_counts = None  # Face counts that differ from the last line, and since when
+        self.pending_since = 0.0
+        self.recorder = None  # Binary per-frame detection log, opened in start()
+        self.preview = None  # PreviewRenderer when the preview window is enabled
+        self.profile = False  # --profile: print the stage latency report on exit
+        self.startup = StartupTimer()  # Startup phase durations, main() starts it at the first import
+        self.startup_profile = False  # --startup-profile: print them once the first frame is protected
+        self.force_autotune = False  # --autotune: re-run the auto-tuner instead of using its cached choice
+        self.model_variant = None  # Name of the loaded model variant
+        self.metrics_server = None
+        self.daemon = False  # --daemon: headless, controlled through the control socket
+        self.control_server = None
+        self.resumed = threading.Event()  # Cleared while paused (cameras released, model kept loaded)
+        self.resumed.set()
+        self.privacy_override = None  # True/False forces privacy mode on/off, None follows detection
+        self.privacy_lock = threading.Lock()
+        self.started_at = None
         
-        # Configure pyautogui
-        pyautogui.FAILSAFE = True
-        pyautogui.PAUSE = 0.1
+        # 啟動計畫只在啟動時 (及設定變更後) 解析一次，並由管理器追蹤開啟的進程
+        self.app_manager = PrivacyAppManager(self.build_launch_plan())
         
-    def load_user_config(self):
-        """Loads user configuration"""
-        config_file = "privacy_guard_config.json"
+        # 隱私保護應用程式在背景執行緒開啟/關閉，避免阻塞偵測迴圈
+        self.action_executor = PrivacyActionExecutor({
+            ACTION_ACTIVATE: self.activate_privacy_app,
+            ACTION_DEACTIVATE: self.close_privacy_app,
+        }, on_result=self.on_privacy_action_done)
         
+    def read_user_config(self):
+        """Parses the user configuration file, returns {} if it does not exist and None if it is invalid"""
+        if not os.path.exists(self.config_file):
+            return {}
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                user_config = json.load(f)
+            if not isinstance(user_config, dict):
+                raise ValueError("expected a JSON object")
+            return user_config
+        except Exception as e:
+            logger.warning(f"Failed to read user configuration: {e}")
+            return None
+    
+    def load_user_config(self, user_config=None):
+        """Loads user configuration (read from the configuration file unless given)"""
         # Default configuration
         self.detection_threshold = DETECTION_THRESHOLD
         self.privacy_delay = PRIVACY_DELAY
+        self.privacy_activation_ratio = PRIVACY_ACTIVATION_RATIO
+        self.privacy_deactivation_window = PRIVACY_DEACTIVATION_WINDOW
+        self.privacy_deactivation_ratio = PRIVACY_DEACTIVATION_RATIO
         self.camera_index = CAMERA_INDEX
+        self.camera_indices = CAMERA_INDICES
         self.detection_interval = DETECTION_INTERVAL
+        self.detection_interval_confirm = DETECTION_INTERVAL_CONFIRM
+        self.detection_interval_active = DETECTION_INTERVAL_ACTIVE
+        self.motion_gate_enabled = MOTION_GATE_ENABLED
+        self.motion_threshold = MOTION_THRESHOLD
+        self.motion_max_interval = MOTION_MAX_INTERVAL
+        self.tracker_enabled = TRACKER_ENABLED
+        self.tracker_iou_threshold = TRACKER_IOU_THRESHOLD
+        self.tracker_min_hits = TRACKER_MIN_HITS
+        self.tracker_max_misses = TRACKER_MAX_MISSES
+        self.tiled_detection_enabled = TILED_DETECTION_ENABLED
+        self.tiled_camera_width = TILED_CAMERA_WIDTH
+        self.tiled_camera_height = TILED_CAMERA_HEIGHT
+        self.tile_columns = TILE_COLUMNS
+        self.tile_rows = TILE_ROWS
+        self.tile_overlap = TILE_OVERLAP
+        self.tiles_per_frame = TILES_PER_FRAME
+        self.tiled_full_pass_interval = TILED_FULL_PASS_INTERVAL
         self.enable_face_preview = ENABLE_FACE_PREVIEW
+        self.preview_fps = PREVIEW_FPS
+        self.log_level = LOG_LEVEL
+        self.log_file = LOG_FILE
+        self.max_log_size_mb = MAX_LOG_SIZE_MB
+        self.log_summary_interval = LOG_SUMMARY_INTERVAL
+        self.log_count_hold = LOG_COUNT_HOLD
+        self.metrics_enabled = METRICS_ENABLED
+        self.metrics_port = METRICS_PORT
+        self.save_detection_log = SAVE_DETECTION_LOG
+        self.detection_log_dir = DETECTION_LOG_DIR
+        self.detection_log_max_files = DETECTION_LOG_MAX_FILES
+        self.postprocessor = POSTPROCESSOR
+        self.frame_source_kind = FRAME_SOURCE
+        self.frame_source_path = FRAME_SOURCE_PATH
+        self.frame_pacing = FRAME_PACING
         
-        # 隱私保護應用程式設定
-        self.privacy_apps = PRIVACY_APPS
-        self.privacy_app_fallback = PRIVACY_APP_FALLBACK
+        # ONNX Runtime 設定
+        self.ort_settings = {
+            'graph_optimization_level': ORT_GRAPH_OPTIMIZATION_LEVEL,
+            'intra_op_num_threads': ORT_INTRA_OP_THREADS,
+            'inter_op_num_threads': ORT_INTER_OP_THREADS,
+            'execution_mode': ORT_EXECUTION_MODE,
+            'enable_mem_pattern': ORT_ENABLE_MEM_PATTERN,
+            'enable_cpu_mem_arena': ORT_ENABLE_CPU_MEM_ARENA,
+        }
+        self.model_cache_dir = MODEL_CACHE_DIR
+        self.control_socket_path = CONTROL_SOCKET_PATH
+        self.config_reload_interval = CONFIG_RELOAD_INTERVAL
+        self.warmup_runs = WARMUP_RUNS
+        self.execution_providers = EXECUTION_PROVIDERS
+        self.model_variants = dict(MODEL_VARIANTS)
+        self.autotune_enabled = AUTOTUNE_ENABLED
+        self.autotune_calibration_path = AUTOTUNE_CALIBRATION_PATH
+        self.autotune_frames = AUTOTUNE_FRAMES
+        self.autotune_min_agreement = AUTOTUNE_MIN_AGREEMENT
+        self.autotune_min_face_frames = AUTOTUNE_MIN_FACE_FRAMES
+        
+        # 隱私保護應用程式設定 (複製一份，使用者設定不會改到 config.py 的預設值)
+        self.privacy_apps = dict(PRIVACY_APPS)
+        self.privacy_app_fallback = dict(PRIVACY_APP_FALLBACK)
         self.privacy_app_custom_path = PRIVACY_APP_CUSTOM_PATH
         
+        if user_config is None:
+            user_config = self.read_user_config()
+            if user_config is None:
+                logger.warning("Using default settings")
+                user_config = {}
+        
         # Load user custom configuration
-        if os.path.exists(config_file):
+        if user_config:
             try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    user_config = json.load(f)
-                    
                 self.detection_threshold = user_config.get('detection_threshold', self.detection_threshold)
                 self.privacy_delay = user_config.get('privacy_delay', self.privacy_delay)
+                self.privacy_activation_ratio = user_config.get('privacy_activation_ratio', self.privacy_activation_ratio)
+                self.privacy_deactivation_window = user_config.get('privacy_deactivation_window', self.privacy_deactivation_window)
+                self.privacy_deactivation_ratio = user_config.get('privacy_deactivation_ratio', self.privacy_deactivation_ratio)
                 self.camera_index = user_config.get('camera_index', self.camera_index)
+                self.camera_indices = user_config.get('camera_indices', self.camera_indices)
                 self.detection_interval = user_config.get('detection_interval', self.detection_interval)
+                self.detection_interval_confirm = user_config.get('detection_interval_confirm', self.detection_interval_confirm)
+                self.detection_interval_active = user_config.get('detection_interval_active', self.detection_interval_active)
+                self.motion_gate_enabled = user_config.get('motion_gate_enabled', self.motion_gate_enabled)
+                self.motion_threshold = user_config.get('motion_threshold', self.motion_threshold)
+                self.motion_max_interval = user_config.get('motion_max_interval', self.motion_max_interval)
+                self.tracker_enabled = user_config.get('tracker_enabled', self.tracker_enabled)
+                self.tracker_iou_threshold = user_config.get('tracker_iou_threshold', self.tracker_iou_threshold)
+                self.tracker_min_hits = user_config.get('tracker_min_hits', self.tracker_min_hits)
+                self.tracker_max_misses = user_config.get('tracker_max_misses', self.tracker_max_misses)
+                self.tiled_detection_enabled = user_config.get('tiled_detection_enabled', self.tiled_detection_enabled)
+                self.tiled_camera_width = user_config.get('tiled_camera_width', self.tiled_camera_width)
+                self.tiled_camera_height = user_config.get('tiled_camera_height', self.tiled_camera_height)
+                self.tile_columns = user_config.get('tile_columns', self.tile_columns)
+                self.tile_rows = user_config.get('tile_rows', self.tile_rows)
+                self.tile_overlap = user_config.get('tile_overlap', self.tile_overlap)
+                self.tiles_per_frame = user_config.get('tiles_per_frame', self.tiles_per_frame)
+                self.tiled_full_pass_interval = user_config.get('tiled_full_pass_interval', self.tiled_full_pass_interval)
                 self.enable_face_preview = user_config.get('enable_face_preview', self.enable_face_preview)
+                self.preview_fps = user_config.get('preview_fps', self.preview_fps)
+                self.log_level = user_config.get('log_level', self.log_level)
+                self.log_file = user_config.get('log_file', self.log_file)
+                self.max_log_size_mb = user_config.get('max_log_size_mb', self.max_log_size_mb)
+                self.log_summary_interval = user_config.get('log_summary_interval', self.log_summary_interval)
+                self.log_count_hold = user_config.get('log_count_hold', self.log_count_hold)
+                self.metrics_enabled = user_config.get('metrics_enabled', self.metrics_enabled)
+                self.metrics_port = user_config.get('metrics_port', self.metrics_port)
+                self.save_detection_log = user_config.get('save_detection_log', self.save_detection_log)
+                self.detection_log_dir = user_config.get('detection_log_dir', self.detection_log_dir)
+                self.detection_log_max_files = user_config.get('detection_log_max_files', self.detection_log_max_files)
+                self.postprocessor = user_config.get('postprocessor', self.postprocessor)
+                self.frame_source_kind = user_config.get('frame_source', self.frame_source_kind)
+                self.frame_source_path = user_config.get('frame_source_path', self.frame_source_path)
+                self.frame_pacing = user_config.get('frame_pacing', self.frame_pacing)
+                
+                # 載入 ONNX Runtime 設定
+                for key, user_key in (('graph_optimization_level', 'ort_graph_optimization_level'),
+                                      ('intra_op_num_threads', 'ort_intra_op_threads'),
+                                      ('inter_op_num_threads', 'ort_inter_op_threads'),
+                                      ('execution_mode', 'ort_execution_mode'),
+                                      ('enable_mem_pattern', 'ort_enable_mem_pattern'),
+                                      ('enable_cpu_mem_arena', 'ort_enable_cpu_mem_arena')):
+                    if user_key in user_config:
+                        self.ort_settings[key] = user_config[user_key]
+                self.model_cache_dir = user_config.get('model_cache_dir', self.model_cache_dir)
+                self.execution_providers = user_config.get('execution_providers', self.execution_providers)
+                if 'model_variants' in user_config:
+                    self.model_variants = dict(user_config['model_variants'])
+                self.autotune_enabled = user_config.get('autotune_enabled', self.autotune_enabled)
+                self.autotune_calibration_path = user_config.get('autotune_calibration_path', self.autotune_calibration_path)
+                self.autotune_frames = user_config.get('autotune_frames', self.autotune_frames)
+                self.autotune_min_agreement = user_config.get('autotune_min_agreement', self.autotune_min_agreement)
+                self.autotune_min_face_frames = user_config.get('autotune_min_face_frames', self.autotune_min_face_frames)
+                self.control_socket_path = user_config.get('control_socket_path', self.control_socket_path)
+                self.config_reload_interval = user_config.get('config_reload_interval', self.config_reload_interval)
+                self.warmup_runs = user_config.get('warmup_runs', self.warmup_runs)
                 
                 # 載入隱私應用程式自訂配置
                 if 'privacy_apps' in user_config:
@@ -84,296 +315,473 @@ class PrivacyGuard:
             except Exception as e:
                 logger.warning(f"Failed to load user configuration, using default settings: {e}")
         
+        # Command line options take precedence over the configuration file
+        for name, value in self.overrides.items():
+            setattr(self, name, value)
+        
+        self.validate_votes()
         logger.info("Configuration loaded from config.py")
+    
+    def validate_votes(self):
+        """Replaces privacy vote settings that TimeWindowVote cannot use with the config.py defaults"""
+        checks = (
+            ('privacy_delay', PRIVACY_DELAY, lambda v: v > 0),
+            ('privacy_activation_ratio', PRIVACY_ACTIVATION_RATIO, lambda v: 0 < v <= 1),
+            ('privacy_deactivation_window', PRIVACY_DEACTIVATION_WINDOW, lambda v: v > 0),
+            ('privacy_deactivation_ratio', PRIVACY_DEACTIVATION_RATIO, lambda v: 0 < v <= 1),
+        )
+        for name, default, valid in checks:
+            value = getattr(self, name)
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not valid(value):
+                logger.warning(f"Invalid {name} {value!r}, using the default {default}")
+                setattr(self, name, default)
+    
+    def check_settings(self):
+        """Raises ValueError or TypeError for settings the detection loop could not apply
+        
+        Builds the objects a reload rebuilds (decoder, scheduler, votes, filters,
+        tiler) without touching the running ones.
+        """
+        for name in ('detection_threshold',) + RELOAD_GROUPS['scheduler']:
+            value = getattr(self, name)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise TypeError(f"{name} must be a number, got {value!r}")
+        if not 0.0 < self.detection_threshold <= 1.0:
+            raise ValueError(f"detection_threshold must be in (0, 1], got {self.detection_threshold!r}")
+        for name in RELOAD_GROUPS['scheduler']:
+            if getattr(self, name) < 0:
+                raise ValueError(f"{name} must not be negative, got {getattr(self, name)!r}")
+        create_decoder(self.postprocessor, self.detection_threshold)
+        self.create_votes()
+        self.create_filters()
+        tiler = self.create_tiler()
+        if tiler is not None and not tiler.schedule(self.tiled_camera_width, self.tiled_camera_height, 0.0):
+            raise ValueError("tiled mode needs at least one tile")
+    
+    def config_snapshot(self):
+        """Current value of every hot-reloadable setting, per RELOAD_GROUPS group"""
+        return {group: copy.deepcopy(tuple(getattr(self, name) for name in names))
+                for group, names in RELOAD_GROUPS.items()}
+    
+    def reload_config(self):
+        """Re-reads the configuration file and rebuilds only what the changed settings affect
+        
+        Runs on the detection thread between frames, so no frame sees a half
+        applied configuration. A file that does not parse (e.g. while an editor
+        is still writing it) is ignored until it changes again.
+        """
+        user_config = self.read_user_config()
+        if user_config is None:
+            logger.warning("Configuration change ignored, keeping the current settings")
+            return False
+        
+        # Load into a copy first, so invalid values never reach the running guard
+        candidate = copy.copy(self)
+        candidate.load_user_config(user_config)
+        try:
+            candidate.check_settings()
+        except (TypeError, ValueError, ZeroDivisionError) as e:
+            logger.warning(f"Configuration change ignored, keeping the current settings: {e}")
+            return False
+        
+        previous = self.config_snapshot()
+        for name in RELOAD_SETTINGS:
+            setattr(self, name, getattr(candidate, name))
+        current = self.config_snapshot()
+        changed = {group for group in RELOAD_GROUPS if current[group] != previous[group]}
+        if not changed:
+            return False
+        logger.info(f"Configuration changed: {', '.join(sorted(changed))}")
+        
+        if 'restart' in changed:
+            names = [name for name, old, new in zip(RELOAD_GROUPS['restart'], previous['restart'], current['restart'])
+                     if old != new]
+            logger.warning(f"Restart Watch Out to apply: {', '.join(names)}")
+        
+        if 'model' in changed:
+            # The post-processor and batch buffers are rebuilt with the session
+            if self.load_model():
+                self.warm_up(self.warmup_runs)
+            else:
+                logger.error("Keeping the previously loaded model")
+        elif 'decoder' in changed:
+            self.setup_decoder()
+        
+        if 'scheduler' in changed:
+            self.scheduler.set_intervals(self.detection_interval,
+                                         self.detection_interval_confirm,
+                                         self.detection_interval_active)
+        
+        if 'cameras' in changed and self.injected_source is None:
+            # New channels get the current votes and filters
+            self.reopen_cameras(previous['cameras'])
+        else:
+            for channel in self.channels:
+                if 'votes' in changed:
+                    channel.activation_vote, channel.deactivation_vote = self.create_votes()
+                if 'filters' in changed:
+                    channel.motion_gate, channel.tracker = self.create_filters()
+                    channel.last_result = (0, [])
+                if 'tiling' in changed:
+                    channel.tiler = self.create_tiler()
+        
+        if 'launch_plan' in changed:
+            self.rebuild_launch_plan()
+        
+        if 'logging' in changed:
+            if current['logging'][1:3] != previous['logging'][1:3]:
+                setup_logging(self.log_level, self.log_file, self.max_log_size_mb, LOG_BACKUP_COUNT)
+            else:
+                logging.getLogger().setLevel(parse_level(self.log_level))
+            self.summary.interval = self.log_summary_interval
+        
+        if 'metrics' in changed:
+            self.metrics.enabled = self.metrics_enabled or self.profile or self.metrics_port > 0
+        
+        if 'preview' in changed and self.preview:
+            self.preview.fps = self.preview_fps
+        
+        if 'watcher' in changed:
+            self.config_watcher.check_interval = self.config_reload_interval
+        return True
+    
+    def reopen_cameras(self, previous_settings):
+        """Replaces the channels after a camera setting changed, falling back to the previous cameras"""
+        for channel in self.channels:
+            channel.close()
+        if not self.initialize_camera():
+            logger.error("Unable to open the new cameras, returning to the previous camera settings")
+            for name, value in zip(RELOAD_GROUPS['cameras'], previous_settings):
+                setattr(self, name, value)
+            if not self.initialize_camera():
+                logger.error("Unable to reopen the cameras, stopping...")
+                self.is_running = False
+                return
+        
+        # Privacy mode stays on until the new cameras vote it off
+        for channel in self.channels:
+            channel.wants_privacy = self.privacy_mode
         
     def load_model(self):
         """Loads the ONNX face detection model"""
         try:
             logger.info("Loading face detection model...")
             
-            # Define execution providers, prioritizing QNN (NPU) over CPU
-            providers = ['QNNExecutionProvider', 'CPUExecutionProvider']
-            
-            self.session = ort.InferenceSession(MODEL_PATH, providers=providers)
+            # Execution providers in priority order, QNN (NPU) before CPU by default
+            model_path, providers = self.select_model()
+            self.session = create_session(model_path, providers, self.ort_settings, self.model_cache_dir)
             
             # Log the actual provider being used
             logger.info(f"ONNX Runtime is using provider: {self.session.get_providers()}")
-            self.input_name = self.session.get_inputs()[0].name
-            self.in_w = self.session.get_inputs()[0].shape[3]
-            self.in_h = self.session.get_inputs()[0].shape[2]
-            logger.info(f"Model loaded successfully! Input size: {self.in_w}x{self.in_h}")
+            model_input = self.session.get_inputs()[0]
+            self.input_name = model_input.name
+            self.in_w = model_input.shape[3]
+            self.in_h = model_input.shape[2]
+            self.preprocessor = Preprocessor(self.in_w, self.in_h)
+            self.batch_inputs = {}
+            self.setup_decoder()
+            logger.info(f"Model loaded successfully! Variant: {self.model_variant} | Input size: {self.in_w}x{self.in_h} | "
+                        f"Batched multi-camera inference: {'on' if self.supports_batching else 'off'}")
             return True
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
             return False
             
+    def select_model(self):
+        """(model path, execution providers) to load: the auto-tuned choice for this machine,
+        or the first model variant with the configured providers"""
+        variants = self.model_variants or {'default': MODEL_PATH}
+        self.model_variant, model_path = next(iter(variants.items()))
+        if not self.autotune_enabled:
+            return model_path, self.execution_providers
+        
+        from autotune import AutoTuner
+        tuner = AutoTuner(variants, self.execution_providers, self.ort_settings, self.model_cache_dir,
+                          postprocessor=self.postprocessor, threshold=self.detection_threshold,
+                          calibration_path=self.autotune_calibration_path, num_frames=self.autotune_frames,
+                          min_agreement=self.autotune_min_agreement,
+                          min_face_frames=self.autotune_min_face_frames, frame_size=(CAMERA_WIDTH, CAMERA_HEIGHT),
+                          warmup_runs=self.warmup_runs)
+        try:
+            choice = tuner.select(force=self.force_autotune)
+        except Exception as e:
+            logger.warning(f"Auto-tune failed: {e}")
+            choice = None
+        if choice is None:
+            logger.warning("Auto-tune found no usable model variant, using the configured model and providers")
+            return model_path, self.execution_providers
+        self.model_variant = choice['variant']
+        # The configured providers stay behind the chosen one as fallbacks
+        return choice['model_path'], [choice['provider']] + [p for p in self.execution_providers if p != choice['provider']]
+    
+    def setup_decoder(self):
+        """Picks the post-processor and binds only the model outputs it uses"""
+        self.decoder = create_decoder(self.postprocessor, self.detection_threshold)
+        model_outputs = self.session.get_outputs()
+        self.output_names = [model_outputs[i].name for i in self.decoder.output_indices]
+        logger.info(f"Post-processor: {self.decoder.name} (threshold {self.detection_threshold})")
+        self.inference = None
+        if BoundInference.supports(self.session):
+            self.inference = BoundInference(self.session, self.preprocessor.input_tensor, self.output_names)
+    
+    @property
+    def supports_batching(self):
+        """True when the model's batch dimension is dynamic, so all cameras share one run"""
+        if self.session is None:
+            return False
+        batch = self.session.get_inputs()[0].shape[0]
+        return not isinstance(batch, int) or batch <= 0
+    
+    def create_filters(self):
+        """Motion gate and face tracker for one camera, None for those that are disabled"""
+        motion_gate = MotionGate(self.motion_threshold, self.motion_max_interval) if self.motion_gate_enabled else None
+        tracker = FaceTracker(self.tracker_iou_threshold, self.tracker_min_hits,
+                              self.tracker_max_misses) if self.tracker_enabled else None
+        return motion_gate, tracker
+    
+    def create_tiler(self):
+        """Tile scheduler for one camera in tiled high-resolution mode, otherwise None"""
+        if not self.tiled_detection_enabled:
+            return None
+        return FrameTiler(self.tile_columns, self.tile_rows, self.tile_overlap,
+                          self.tiles_per_frame, self.tiled_full_pass_interval)
+    
+    def create_votes(self):
+        """Activation and deactivation votes for one camera"""
+        # Activation passes after privacy_delay of (mostly) multiple people
+        activation_vote = TimeWindowVote(self.privacy_delay / self.privacy_activation_ratio,
+                                         self.privacy_activation_ratio)
+        deactivation_vote = TimeWindowVote(self.privacy_deactivation_window,
+                                           self.privacy_deactivation_ratio)
+        return activation_vote, deactivation_vote
+    
+    def create_channel(self, frame_source):
+        """Builds the per-camera state (motion gate, tracker, privacy votes) for a frame source"""
+        return CameraChannel(frame_source.name, frame_source, *self.create_votes(), *self.create_filters(),
+                             tiler=self.create_tiler())
+    
+    def create_frame_sources(self):
+        """One source per configured camera, or the single recorded/synthetic source"""
+        if self.injected_source is not None:
+            return [self.injected_source]
+        
+        camera_indices = [self.camera_index]
+        if self.frame_source_kind == 'camera' and self.camera_indices:
+            camera_indices = list(self.camera_indices)
+        
+        # Tiled mode captures more pixels so distant faces survive the downscaling
+        if self.tiled_detection_enabled:
+            width, height = self.tiled_camera_width, self.tiled_camera_height
+        else:
+            width, height = CAMERA_WIDTH, CAMERA_HEIGHT
+        
+        return [create_frame_source(
+            self.frame_source_kind,
+            camera_index=camera_index,
+            path=self.frame_source_path,
+            width=width,
+            height=height,
+            fps=CAMERA_FPS,
+            pacing=self.frame_pacing,
+        ) for camera_index in camera_indices]
+    
     def initialize_camera(self):
-        """Initializes the camera"""
+        """Initializes the cameras (or the configured frame source)"""
         try:
-            self.cap = cv2.VideoCapture(self.camera_index)
-            if not self.cap.isOpened():
-                logger.error("Unable to open camera!")
-                return False
-            
-            # Set camera parameters
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
-            self.cap.set(cv2.CAP_PROP_FPS, CAMERA_FPS)
+            self.channels = []
+            for frame_source in self.create_frame_sources():
+                channel = self.create_channel(frame_source)
+                if not channel.open(CAPTURE_BUFFER_SIZE):
+                    for opened in self.channels:
+                        opened.close()
+                    self.channels = []
+                    return False
+                self.channels.append(channel)
+            self.frame_source = self.channels[0].frame_source
             
-            # If preview is enabled, initialize window
-            if self.enable_face_preview:
-                logger.debug("Attempting to initialize preview window...")
-                try:
-                    window_name = 'Watch Out - Face Detection Preview'
-                    cv2.namedWindow(window_name, cv2.WINDOW_AUTOSIZE)
-                    logger.info("Preview window initialized")
-                    logger.debug("Preview window initialized successfully.")
-                except Exception as e:
-                    logger.warning(f"Preview window initialization failed: {e}")
-                    self.enable_face_preview = False
-            
-            logger.info(f"Camera {self.camera_index} initialized successfully")
+            for channel in self.channels:
+                logger.info(f"{channel.name.capitalize()} initialized successfully")
             return True
         except Exception as e:
             logger.error(f"Failed to initialize camera: {e}")
             return False
             
+    def warm_up(self, runs, batch_size=1):
+        """Runs the model a few times on a zero input, so the first real frame has normal latency
+        
+        The first runs of a session pay for lazy initialization, memory arena
+        growth and kernel selection.
+        """
+        if runs <= 0:
+            return
+        try:
+            started = time.perf_counter()
+            if batch_size > 1:
+                tensor, _ = self.batch_input(batch_size)
+                tensor.fill(0)
+                for _ in range(runs):
+                    self.session.run(self.output_names, {self.input_name: tensor})
+            else:
+                self.preprocessor.input_tensor.fill(0)
+                for _ in range(runs):
+                    self.run_inference(self.preprocessor.input_tensor)
+            logger.info(f"Model warmed up: {runs} inferences (batch {batch_size}) in "
+                        f"{(time.perf_counter() - started) * 1000:.0f} ms")
+        except Exception as e:
+            logger.warning(f"Model warm-up failed: {e}")
+    
+    def run_inference(self, img):
+        """Runs the model on a preprocessed input tensor, returns the fetched outputs"""
+        if self.inference:
+            # IOBinding: img is the bound input tensor, outputs land in preallocated buffers
+            return self.inference.run()
+        return self.session.run(self.output_names, {self.input_name: img})
+    
     def detect_faces(self, frame):
         """Detects faces and returns the number of faces"""
         try:
-            h, w, _ = frame.shape
+            h, w = frame.shape[:2]
             
-            # Preprocess image
-            img = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            img = cv2.resize(img, (self.in_w, self.in_h))
-            img = np.expand_dims(img, axis=0)
-            img = np.expand_dims(img, axis=0)
-            img = img.astype(np.uint8)
+            # Preprocess image into the preallocated input tensor
+            started = time.perf_counter()
+            img = self.preprocessor(frame)
+            preprocessed = time.perf_counter()
             
             # Run inference
-            outputs = self.session.run(None, {self.input_name: img})
+            outputs = self.run_inference(img)
+            inferred = time.perf_counter()
             
             # Parse output
             # outputs[0] = heatmap (1, 1, 60, 80)
-            # outputs[1] = bbox (1, 4, 60, 80) 
-            # outputs[2] = landmark (1, 10, 60, 80)
+            # The model also has bbox (1, 4, 60, 80) and landmark (1, 10, 60, 80)
+            # outputs, which are only fetched if the post-processor needs them
             
             heatmap = outputs[0][0, 0]  # (60, 80)
-            bbox_maps = outputs[1][0]   # (4, 60, 80)
-            
-            # Find faces from heatmap
-            # Convert uint8 to float and normalize
-            heatmap_norm = heatmap.astype(np.float32) / 255.0
-            
-            # Use threshold to find possible face locations
-            threshold = self.detection_threshold
             
-            # Use morphological operations to find connected regions
-            heatmap_binary = (heatmap_norm > threshold).astype(np.uint8)
+            # Find faces from the heatmap with the post-processor chosen at startup
+            result = self.decoder.decode(heatmap, w, h)
             
-            # Find connected components
-            from scipy import ndimage
-            labeled_array, num_features = ndimage.label(heatmap_binary)
-            
-            detected_faces = []
-            face_count = 0
-            
-            # Process each connected component
-            for i in range(1, num_features + 1):
-                # Find the location of the component
-                component_mask = (labeled_array == i)
-                if np.sum(component_mask) < 5:  # Ignore too small regions
-                    continue
-                    
-                # Find bounding box
-                rows, cols = np.where(component_mask)
-                if len(rows) == 0:
-                    continue
-                    
-                min_row, max_row = rows.min(), rows.max()
-                min_col, max_col = cols.min(), cols.max()
-                
-                # Convert to original image coordinates
-                x1 = int(min_col * w / heatmap.shape[1])
-                y1 = int(min_row * h / heatmap.shape[0])
-                x2 = int((max_col + 1) * w / heatmap.shape[1])
-                y2 = int((max_row + 1) * h / heatmap.shape[0])
-                
-                # Ensure bounding box is within image bounds
-                x1 = max(0, min(x1, w-1))
-                y1 = max(0, min(y1, h-1))
-                x2 = max(x1+1, min(x2, w))
-                y2 = max(y1+1, min(y2, h))
-                
-                # Calculate average confidence for the region
-                region_confidence = np.mean(heatmap_norm[min_row:max_row+1, min_col:max_col+1])
-                
-                detected_faces.append({
-                    'bbox': (x1, y1, x2, y2),
-                    'confidence': region_confidence
-                })
-                face_count += 1
-                        
-            return face_count, detected_faces
+            self.metrics.observe('preprocess', preprocessed - started)
+            self.metrics.observe('inference', inferred - preprocessed)
+            self.metrics.observe('postprocess', time.perf_counter() - inferred)
+            return result
             
-        except ImportError:
-            # If scipy is not available, use a simplified version
-            logger.warning("scipy not installed, using simplified face detection")
-            return self._detect_faces_simple(frame)
         except Exception as e:
             logger.error(f"Face detection failed: {e}")
             return 0, []
     
-    def _detect_faces_simple(self, frame):
-        """Simplified face detection (no scipy required)"""
+    def batch_input(self, batch_size):
+        """Batch tensor and one Preprocessor per slot, allocated once per batch size"""
+        if batch_size not in self.batch_inputs:
+            tensor = np.zeros((batch_size, 1, self.in_h, self.in_w), dtype=np.uint8)
+            preprocessors = [Preprocessor(self.in_w, self.in_h, tensor[i:i + 1]) for i in range(batch_size)]
+            self.batch_inputs[batch_size] = (tensor, preprocessors)
+        return self.batch_inputs[batch_size]
+    
+    def detect_faces_batch(self, frames):
+        """Detects faces on frames from several cameras, returns one (count, faces) per frame
+        
+        Models with a dynamic batch dimension get all frames stacked into a single
+        session.run; fixed batch-1 models run the shared session once per frame.
+        """
+        if len(frames) <= 1 or not self.supports_batching:
+            return [self.detect_faces(frame) for frame in frames]
+        
         try:
-            h, w, _ = frame.shape
-            
-            # Preprocess image
-            img = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            img = cv2.resize(img, (self.in_w, self.in_h))
-            img = np.expand_dims(img, axis=0)
-            img = np.expand_dims(img, axis=0)
-            img = img.astype(np.uint8)
-            
-            # Run inference
-            outputs = self.session.run(None, {self.input_name: img})
-            heatmap = outputs[0][0, 0]  # (60, 80)
-            
-            # Convert uint8 to float and normalize
-            heatmap_norm = heatmap.astype(np.float32) / 255.0
-            
-            # Use threshold to find possible face locations
-            threshold = self.detection_threshold
-            
-            # Simple grid search
-            grid_size = 8  # Size of each grid
-            face_count = 0
-            detected_faces = []
-            
-            for i in range(0, heatmap.shape[0], grid_size):
-                for j in range(0, heatmap.shape[1], grid_size):
-                    grid = heatmap_norm[i:i+grid_size, j:j+grid_size]
-                    max_confidence = grid.max()
-                    
-                    if max_confidence > threshold:
-                        face_count += 1
-                        # Calculate position in original image
-                        x1 = int(j * w / heatmap.shape[1])
-                        y1 = int(i * h / heatmap.shape[0])
-                        x2 = int((j + grid_size) * w / heatmap.shape[1])
-                        y2 = int((i + grid_size) * h / heatmap.shape[0])
-                        
-                        detected_faces.append({
-                            'bbox': (x1, y1, x2, y2),
-                            'confidence': max_confidence
-                        })
-                        
-            return face_count, detected_faces
+            started = time.perf_counter()
+            tensor, preprocessors = self.batch_input(len(frames))
+            for preprocessor, frame in zip(preprocessors, frames):
+                preprocessor(frame)
+            preprocessed = time.perf_counter()
+            heatmaps = self.session.run(self.output_names, {self.input_name: tensor})[0]
+            inferred = time.perf_counter()
+            results = []
+            for i, frame in enumerate(frames):
+                h, w = frame.shape[:2]
+                results.append(self.decoder.decode(heatmaps[i, 0], w, h))
             
+            self.metrics.observe('preprocess', preprocessed - started)
+            self.metrics.observe('inference', inferred - preprocessed)
+            self.metrics.observe('postprocess', time.perf_counter() - inferred)
+            return results
         except Exception as e:
-            logger.error(f"Simplified face detection failed: {e}")
-            return 0, []
-            
+            logger.error(f"Batched face detection failed: {e}")
+            return [(0, []) for _ in frames]
+    
+    def detect_channels(self, captures):
+        """Runs detection for (channel, frame, timestamp) captures, returns one (count, faces) each
+        
+        A channel's model run is skipped while that camera is idle and its scene is
+        static; the last result is reused instead. Gating only applies while idle
+        and no tracked face is still unconfirmed (see CameraChannel.can_skip_inference),
+        so confirming multiple people and leaving privacy mode always run on fresh
+        detections. With the tracker enabled the result is the confirmed tracks
+        (with track_id and age), coasted along their estimated motion on frames
+        where the model is skipped. In tiled mode the full frame's detections are
+        merged with the latest detections of every tile (see FrameTiler); the
+        scheduled tiles run even when the motion gate skips the full frame.
+        """
+        results = [None] * len(captures)
+        pending = []  # (capture index, whether the full frame runs, scheduled tile indices)
+        for i, (channel, frame, timestamp) in enumerate(captures):
+            full_frame = not (channel.can_skip_inference() and not channel.motion_gate.should_infer(frame))
+            # Scheduled tiles bypass the motion gate, a distant face barely moves the whole-frame score
+            tiles = channel.tiler.schedule(frame.shape[1], frame.shape[0], timestamp) if channel.tiler else []
+            channel.inferred = full_frame or bool(tiles)
+            if not channel.inferred:
+                if channel.tracker is not None:
+                    results[i] = channel.tracker.predict(timestamp)
+                else:
+                    results[i] = channel.last_result
+            else:
+                pending.append((i, full_frame, tiles))
+        
+        self.metrics.count('frames', len(captures))
+        
+        # In tiled mode a camera contributes its full frame (unless gated) plus the
+        # scheduled tiles, all of them go through one detect_faces_batch call
+        inputs = []
+        for i, full_frame, tiles in pending:
+            channel, frame, _ = captures[i]
+            if full_frame:
+                inputs.append(frame)
+            if tiles:
+                inputs.extend(channel.tiler.crops(frame, tiles))
+        # Model runs: every full frame and tile sent to the session
+        self.metrics.count('inferences', len(inputs))
+        self.metrics.count('gate_skips', len(captures) - sum(full_frame for _, full_frame, _ in pending))
+        tile_count = sum(len(tiles) for _, _, tiles in pending)
+        if tile_count:
+            self.metrics.count('tiles', tile_count)
+        
+        outputs = iter(self.detect_faces_batch(inputs))
+        for i, full_frame, tiles in pending:
+            channel, _, timestamp = captures[i]
+            detection = next(outputs) if full_frame else None
+            if channel.tiler is not None:
+                channel.tiler.update(tiles, [next(outputs) for _ in tiles], timestamp)
+                detection = channel.tiler.merge(detection[1] if detection is not None else None)
+            channel.raw_face_count = detection[0]
+            if channel.tracker is not None:
+                started = time.perf_counter()
+                detection = channel.tracker.update(detection[1], timestamp)
+                self.metrics.observe('tracking', time.perf_counter() - started)
+            channel.last_result = detection
+            results[i] = detection
+        return results
+    
+    def build_launch_plan(self):
+        """解析並驗證隱私保護應用程式設定，產生啟動計畫"""
+        return build_launch_plan(self.privacy_apps, self.privacy_app_fallback, self.privacy_app_custom_path)
+    
+    def rebuild_launch_plan(self):
+        """設定變更後重新產生啟動計畫"""
+        self.app_manager.set_plan(self.build_launch_plan())
+    
     def open_custom_app(self):
-        """開啟隱私保護應用程式"""
+        """開啟隱私保護應用程式 (已在執行中則沿用或切換至前景)"""
         try:
-            # 獲取當前操作系統
-            current_os = sys.platform
-            
-            # 如果有自訂路徑，優先使用
-            if self.privacy_app_custom_path and os.path.exists(self.privacy_app_custom_path):
-                try:
-                    self.app_process = subprocess.Popen([self.privacy_app_custom_path])
-                    logger.info(f"隱私保護應用程式已透過自訂路徑成功開啟: {self.privacy_app_custom_path}")
-                    return True
-                except Exception as e:
-                    logger.warning(f"自訂路徑開啟失敗: {e}")
-            
-            # 檢查是否支援當前操作系統
-            if current_os not in self.privacy_apps:
-                logger.error(f"不支援的作業系統: {current_os}")
-                return False
-            
-            # 獲取當前系統的應用程式配置
-            app_config = self.privacy_apps[current_os]
-            app_name = app_config["name"]
-            app_command = app_config["command"]
-            fallback_path = app_config.get("fallback_path", "")
-            
-            logger.info(f"正在開啟隱私保護應用程式: {app_name}")
-            
-            # 嘗試執行主要命令
-            try:
-                if current_os == "darwin":  # macOS
-                    if app_command.startswith("open -a"):
-                        # 提取應用程式名稱
-                        app_name_from_cmd = app_command.split("'")[1] if "'" in app_command else app_name
-                        result = subprocess.run([
-                            "open", "-a", app_name_from_cmd
-                        ], capture_output=True, text=True, timeout=10)
-                        
-                        if result.returncode == 0:
-                            logger.info(f"{app_name} 已成功開啟")
-                            return True
-                        else:
-                            logger.warning(f"Open 命令執行失敗: {result.stderr}")
-                    else:
-                        # 直接執行命令
-                        cmd_parts = app_command.split()
-                        result = subprocess.run(cmd_parts, capture_output=True, text=True, timeout=10)
-                        if result.returncode == 0:
-                            logger.info(f"{app_name} 已成功開啟")
-                            return True
-                    
-                    # 如果命令失敗，嘗試備用路徑
-                    if fallback_path and os.path.exists(fallback_path):
-                        self.app_process = subprocess.Popen([fallback_path])
-                        logger.info(f"{app_name} 已透過備用路徑成功開啟")
-                        return True
-                        
-                elif current_os == "win32":  # Windows
-                    cmd_parts = app_command.split()
-                    self.app_process = subprocess.Popen(cmd_parts)
-                    logger.info(f"{app_name} 在 Windows 上成功開啟")
-                    return True
-                    
-            except subprocess.TimeoutExpired:
-                logger.warning(f"{app_name} 開啟命令逾時")
-            except Exception as e:
-                logger.warning(f"開啟 {app_name} 失敗: {e}")
-            
-            # 如果主要應用程式失敗，嘗試備用應用程式
-            if current_os in self.privacy_app_fallback:
-                fallback_config = self.privacy_app_fallback[current_os]
-                fallback_name = fallback_config["name"]
-                fallback_command = fallback_config["command"]
-                
-                logger.info(f"嘗試開啟備用應用程式: {fallback_name}")
-                
-                try:
-                    if current_os == "darwin":
-                        if fallback_command.startswith("open -a"):
-                            app_name_from_cmd = fallback_command.split("'")[1] if "'" in fallback_command else fallback_name
-                            result = subprocess.run([
-                                "open", "-a", app_name_from_cmd
-                            ], capture_output=True, text=True, timeout=10)
-                            
-                            if result.returncode == 0:
-                                logger.info(f"備用應用程式 {fallback_name} 已成功開啟")
-                                return True
-                    elif current_os == "win32":
-                        cmd_parts = fallback_command.split()
-                        self.app_process = subprocess.Popen(cmd_parts)
-                        logger.info(f"備用應用程式 {fallback_name} 已成功開啟")
-                        return True
-                        
-                except Exception as e:
-                    logger.warning(f"開啟備用應用程式失敗: {e}")
-            
-            logger.error("無法開啟任何隱私保護應用程式，請檢查配置")
-            return False
-            
+            return self.app_manager.activate()
         except Exception as e:
             logger.error(f"開啟隱私保護應用程式失敗: {e}")
             return False
@@ -381,12 +789,12 @@ class PrivacyGuard:
     def close_privacy_app(self):
         """關閉隱私保護應用程式"""
         try:
-            # 注意：我們不會強制關閉應用程式，因為用戶可能正在使用它
-            if self.app_process:
+            # 注意：我們不會強制關閉應用程式，因為用戶可能正在使用它。
+            # 管理器會繼續追蹤它，下次啟動隱私模式時直接沿用，不會重複開啟。
+            if self.app_manager.running:
                 current_os = sys.platform
                 app_name = self.privacy_apps.get(current_os, {}).get("name", "隱私保護應用程式")
                 logger.info(f"{app_name} 已為隱私保護而開啟。如需要可手動關閉。")
-                self.app_process = None
             
             logger.info("隱私保護應用程式模式已停用")
             return True
@@ -399,6 +807,7 @@ class PrivacyGuard:
         """Creates a privacy protection by opening an application"""
         try:
             self.privacy_mode = True
+            self.metrics.count('activations')
             # Display a clear privacy mode message in the terminal
             logger.info("\n" + "="*60)
             logger.info("🔒 Watch Out Mode Activated!")
@@ -407,151 +816,301 @@ class PrivacyGuard:
             logger.info("="*60)
             logger.info("Watch Out Mode activated")
             
-            # 開啟指定的隱私保護應用程式
-            app_success = self.open_custom_app()
-            if app_success:
-                current_os = sys.platform
-                app_name = self.privacy_apps.get(current_os, {}).get("name", "隱私保護應用程式")
-                logger.info(f"{app_name} 隱私保護已成功啟動")
-            else:
-                logger.warning("隱私保護應用程式啟動失敗，繼續使用標準模式")
+            # 在背景開啟指定的隱私保護應用程式
+            self.action_executor.submit(ACTION_ACTIVATE)
             
         except Exception as e:
             logger.error(f"Failed to activate Watch Out Mode: {e}")
+    
+    def activate_privacy_app(self):
+        """開啟隱私保護應用程式 (在隱私動作執行緒上執行)"""
+        app_success = self.open_custom_app()
+        if app_success:
+            current_os = sys.platform
+            app_name = self.privacy_apps.get(current_os, {}).get("name", "隱私保護應用程式")
+            logger.info(f"{app_name} 隱私保護已成功啟動")
+        else:
+            logger.warning("隱私保護應用程式啟動失敗，繼續使用標準模式")
+        return app_success
+    
+    def on_privacy_action_done(self, result):
+        """Reports how long a privacy action waited and ran"""
+        logger.info(f"Privacy action '{result['action']}' "
+                    f"{'succeeded' if result['success'] else 'failed'} | "
+                    f"queued {result['queue_delay'] * 1000:.0f} ms | took {result['duration'] * 1000:.0f} ms")
             
     def remove_privacy_overlay(self):
         """Removes the privacy mode"""
         try:
             if self.privacy_mode:
                 self.privacy_mode = False
+                self.metrics.count('deactivations')
                 logger.info("\n" + "="*60)
                 logger.info("✅ Watch Out Mode Deactivated")
                 logger.info("Environment secure. You can continue your work.")
                 logger.info("="*60)
                 logger.info("Watch Out Mode deactivated")
                 
-                # 關閉隱私保護應用程式
-                self.close_privacy_app()
+                # 在背景關閉隱私保護應用程式
+                self.action_executor.submit(ACTION_DEACTIVATE)
                 
         except Exception as e:
             logger.error(f"Failed to deactivate Watch Out Mode: {e}")
             
-    def update_privacy_status(self, face_count):
-        """Updates the privacy status based on the number of detected faces"""
-        current_time = time.time()
-        
-        if face_count > 1:  # Multiple people detected
-            if not self.privacy_mode:
-                if self.last_detection_time == 0:
-                    self.last_detection_time = current_time
-                elif current_time - self.last_detection_time >= self.privacy_delay:
-                    # Activate privacy mode
-                    self.create_privacy_overlay()
-                    logger.info(f"Activating Watch Out Mode - {face_count} people detected")
-        else:  # One person or no one
-            self.last_detection_time = 0
-            if self.privacy_mode:
+    def update_privacy_status(self, face_count, channel=None):
+        """Feeds a face count into a camera's privacy votes and updates the combined privacy mode
+        
+        Each camera decides on its own (see CameraChannel.vote); privacy mode is on
+        while any camera wants it, and ends once every camera is secure again.
+        """
+        channel = channel or self.channels[0]
+        if channel.vote(face_count, time.monotonic()):
+            self.apply_privacy_state(f"{face_count} people detected by {channel.name}")
+    
+    def apply_privacy_state(self, reason):
+        """Switches privacy mode to the forced state, or to the combined camera decision"""
+        with self.privacy_lock:
+            if self.privacy_override is not None:
+                wants_privacy = self.privacy_override
+            else:
+                wants_privacy = any(c.wants_privacy for c in self.channels)
+            
+            if wants_privacy and not self.privacy_mode:
+                # Activate privacy mode
+                self.create_privacy_overlay()
+                logger.info(f"Activating Watch Out Mode - {reason}")
+            elif not wants_privacy and self.privacy_mode:
                 # Deactivate privacy mode
                 self.remove_privacy_overlay()
-                logger.info("Deactivating Watch Out Mode - Environment secure")
-                
+                logger.info(f"Deactivating Watch Out Mode - {reason if self.privacy_override is not None else 'Environment secure'}")
+    
+    def set_privacy_override(self, value):
+        """Forces privacy mode on (True) or off (False), None returns to automatic detection"""
+        self.privacy_override = value
+        if value is None:
+            self.apply_privacy_state("automatic detection resumed")
+        else:
+            self.apply_privacy_state(f"forced {'on' if value else 'off'} via control socket")
+    
+    @property
+    def paused(self):
+        return not self.resumed.is_set()
+    
+    def pause(self):
+        """Stops inference and releases the cameras at the next frame; the model stays loaded"""
+        self.resumed.clear()
+    
+    def resume(self):
+        self.resumed.set()
+    
+    def wait_while_paused(self):
+        """Runs on the detection thread: releases the cameras until resumed, then reopens them"""
+        for channel in self.channels:
+            channel.close()
+        logger.info("Detection paused, cameras released (model stays loaded)")
+        
+        while self.is_running and not self.resumed.wait(0.5):
+            pass
+        if not self.is_running:
+            return
+        
+        resume_start = time.monotonic()
+        for channel in self.channels:
+            channel.reset()
+            if not channel.open(CAPTURE_BUFFER_SIZE):
+                logger.error("Unable to reopen the cameras, staying paused")
+                for opened in self.channels:
+                    opened.close()
+                self.pause()
+                return
+        logger.info(f"Detection resumed in {(time.monotonic() - resume_start) * 1000:.0f} ms")
+    
+    def status(self):
+        """Snapshot of the current state for the control socket"""
+        return {
+            'state': 'paused' if self.paused else ('running' if self.is_running else 'stopped'),
+            'privacy_mode': self.privacy_mode,
+            'privacy_override': self.privacy_override,
+            'face_count': max((c.face_count for c in self.channels), default=0),
+            'cameras': {c.name: {'face_count': c.face_count, 'wants_privacy': c.wants_privacy}
+                        for c in self.channels},
+            'uptime_s': time.monotonic() - self.started_at if self.started_at else 0.0,
+            'model': {'variant': self.model_variant,
+                      'provider': self.session.get_providers()[0] if self.session else None},
+            'time_to_protected_s': self.startup.total if 'first_protected' in self.startup.phases else None,
+        }
+    
+    def handle_command(self, command, args):
+        """Control socket commands: status, faces, pause, resume, privacy on|off|auto, stop"""
+        if command == 'status':
+            return {'ok': True, **self.status()}
+        if command == 'faces':
+            status = self.status()
+            return {'ok': True, 'face_count': status['face_count'], 'cameras': status['cameras']}
+        if command == 'pause':
+            self.pause()
+            return {'ok': True, 'state': 'paused'}
+        if command == 'resume':
+            self.resume()
+            return {'ok': True, 'state': 'running'}
+        if command == 'privacy' and len(args) == 1 and args[0] in ('on', 'off', 'auto'):
+            self.set_privacy_override({'on': True, 'off': False, 'auto': None}[args[0]])
+            return {'ok': True, 'privacy_mode': self.privacy_mode, 'privacy_override': self.privacy_override}
+        if command == 'stop':
+            self.is_running = False
+            self.resume()
+            return {'ok': True, 'state': 'stopping'}
+        return {'ok': False, 'error': f"unknown command: {' '.join([command] + args)}",
+                'commands': ['status', 'faces', 'pause', 'resume', 'privacy on|off|auto', 'stop']}
+    
+    def read_frames(self):
+        """Reads the next frame of every camera, returns (channel, frame, timestamp) for those that delivered"""
+        captures = []
+        for channel in self.channels:
+            if channel.exhausted:
+                continue
+            ret, frame, timestamp = channel.read()
+            if ret:
+                captures.append((channel, frame, timestamp))
+            elif not channel.exhausted:
+                logger.warning(f"Unable to read frame from {channel.name}")
+        return captures
+    
+    @property
+    def frames_dropped(self):
+        """Number of captured frames that were never processed, over all cameras"""
+        return sum(channel.frames_dropped for channel in self.channels)
+    
+    @property
+    def is_paced(self):
+        return any(channel.frame_source.is_paced for channel in self.channels)
+    
+    def detection_state(self):
+        """Current scheduling state: idle, confirming multiple people, or privacy mode active"""
+        if self.privacy_mode:
+            return STATE_ACTIVE
+        if any(channel.state() == STATE_CONFIRMING for channel in self.channels):
+            return STATE_CONFIRMING
+        return STATE_IDLE
+    
+    def log_status(self, captures, results):
+        """Logs the status line on privacy mode transitions, and when new face counts held for log_count_hold
+        
+        Short-lived count changes (a noisy detection) are not logged; they still
+        show up in the face count distribution of the periodic summary.
+        """
+        for _, (count, _) in zip(captures, results):
+            self.summary.record(count)
+        now = time.monotonic()
+        if self.summary.due(now):
+            logger.info(self.summary.report(now))
+        
+        counts = tuple((channel.name, count) for (channel, _, _), (count, _) in zip(captures, results))
+        if self.last_status is not None and self.privacy_mode == self.last_status[1]:
+            if counts == self.last_status[0]:
+                self.pending_counts = None
+                return
+            if counts != self.pending_counts:
+                self.pending_counts = counts
+                self.pending_since = now
+            if now - self.pending_since < self.log_count_hold:
+                return
+        self.last_status = (counts, self.privacy_mode)
+        self.pending_counts = None
+        
+        if self.privacy_mode:
+            status = "🔒 Privacy Mode"
+        else:
+            status = "✅ Secure"
+        
+        if len(self.channels) > 1:
+            detected = ", ".join(f"{channel.name}: {count}"
+                                 for (channel, _, _), (count, _) in zip(captures, results))
+        else:
+            detected = str(results[0][0])
+        preview_info = " | Preview: On" if self.enable_face_preview else ""
+        logger.info(f"Detected {detected} people | Status: {status}{preview_info} | Press Ctrl+C to exit")
+    
+    def report_startup(self):
+        """Logs the time to the first protected frame, and every startup phase with --startup-profile"""
+        logger.info(f"First frame protected {self.startup.total * 1000:.0f} ms after launch")
+        if self.startup_profile:
+            for line in self.startup.report().splitlines():
+                logger.info(line)
+    
     def run_detection_loop(self):
         """Main detection loop"""
         logger.info("Starting face detection...")
         
         while self.is_running:
             try:
-                ret, frame = self.cap.read()
-                if not ret:
-                    logger.warning("Unable to read frame from camera")
+                if self.paused:
+                    self.wait_while_paused()
                     continue
-                    
-                # Detect faces
-                face_count, faces = self.detect_faces(frame)
                 
-                # If preview is enabled, display face boxes
-                if self.enable_face_preview:
-                    display_frame = frame.copy()
-                    
-                    # Draw face boxes
-                    for face in faces:
-                        if isinstance(face, dict):
-                            x1, y1, x2, y2 = face['bbox']
-                            confidence = face['confidence']
-                            
-                            # Choose color based on confidence
-                            if confidence > 0.8:
-                                color = (0, 255, 0)  # Green - high confidence
-                            elif confidence > 0.6:
-                                color = (0, 255, 255)  # Yellow - medium confidence
-                            else:
-                                color = (255, 0, 0)  # Blue - low confidence
-                            
-                            # Draw rectangle
-                            cv2.rectangle(display_frame, (x1, y1), (x2, y2), color, 2)
-                            
-                            # Display confidence
-                            cv2.putText(display_frame, f'{confidence:.2f}', 
-                                      (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 
-                                      0.6, color, 2)
-                        else:
-                            # Compatibility with old format
-                            x1, y1, x2, y2 = face
-                            cv2.rectangle(display_frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                    
-                    # Display status information
-                    if self.privacy_mode:
-                        status_text = "Privacy Mode"
-                        status_color = (0, 0, 255)  # Red
-                    else:
-                        status_text = "Secure"
-                        status_color = (0, 255, 0)  # Green
-                    
-                    # Display status on frame
-                    cv2.putText(display_frame, f'Detected {face_count} people | {status_text}', 
-                              (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, status_color, 2)
-                    
-                    # Add exit hint
-                    (text_width, text_height), _ = cv2.getTextSize("Press ESC to exit", cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)
-                    cv2.putText(display_frame, "Press ESC to exit", 
-                              (display_frame.shape[1] - text_width - 10, 30), 
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+                # Apply configuration file changes between frames
+                if self.config_watcher.changed():
+                    self.reload_config()
+                
+                frame_start = time.monotonic()
+                captures = self.read_frames()
+                if not captures:
+                    if all(channel.exhausted for channel in self.channels):
+                        logger.info("Frame source exhausted, stopping...")
+                        self.is_running = False
+                        break
+                    continue
+                self.startup.mark('first_frame')
+                if logger.isEnabledFor(logging.DEBUG):
+                    oldest = min(timestamp for _, _, timestamp in captures)
+                    logger.debug(f"Frame age: {(time.monotonic() - oldest) * 1000:.1f} ms | "
+                                 f"Dropped frames: {self.frames_dropped}")
                     
-                    # Force display of preview window (improved)
-                    window_name = 'Watch Out - Face Detection Preview'
-                    logger.debug(f"Attempting to show frame in window {window_name}...")
-                    try:
-                        cv2.imshow(window_name, display_frame)
-                        logger.debug("imshow call successful.")
-                        
-                        # Handle keyboard input
-                        key = cv2.waitKey(1) & 0xFF
-
-                        # On ESC key press, exit the program
-                        if key == 27:
-                            logger.info("ESC key pressed, exiting...")
-                            self.is_running = False
-                            break
-
-                    except Exception as e:
-                        logger.warning(f"Error displaying preview window: {e}")
-                        self.enable_face_preview = False
-                        cv2.destroyAllWindows()
+                # Detect faces (or reuse the last result while a camera's scene is static)
+                detect_start = time.monotonic()
+                self.metrics.observe('read', detect_start - frame_start)
+                results = self.detect_channels(captures)
+                detect_time = time.monotonic() - detect_start
+                self.metrics.observe('detect', detect_time)
+                first_inference = 'first_inference' not in self.startup.phases and any(
+                    c.inferred for c, _, _ in captures)
+                if first_inference:
+                    self.startup.mark('first_inference')
                 
-                # Update privacy status
-                self.update_privacy_status(face_count)
+                # Update privacy status, each camera votes on its own
+                for (channel, _, timestamp), (face_count, faces) in zip(captures, results):
+                    channel.face_count = face_count
+                    update_start = time.monotonic()
+                    self.update_privacy_status(face_count, channel)
+                    update_time = time.monotonic() - update_start
+                    self.metrics.observe('capture', detect_start - timestamp)
+                    self.metrics.observe('privacy_update', update_time)
+                    if self.recorder:
+                        self.recorder.record(self.channels.index(channel), face_count, faces,
+                                             self.privacy_mode, channel.inferred,
+                                             capture_ms=(detect_start - timestamp) * 1000,
+                                             detect_ms=detect_time * 1000,
+                                             update_ms=update_time * 1000)
+                        self.metrics.observe('record', time.monotonic() - update_start - update_time)
                 
-                # Display status in terminal
-                if self.privacy_mode:
-                    status = "🔒 Privacy Mode"
-                else:
-                    status = "✅ Secure"
+                # The privacy decision now rests on a real detection
+                if first_inference:
+                    self.startup.mark('first_protected')
+                    self.report_startup()
+                
+                # Hand the first camera's result to the preview renderer (drawn on the main thread)
+                channel, frame, _ = captures[0]
+                if self.preview and channel is self.channels[0]:
+                    face_count, faces = results[0]
+                    self.preview.publish(frame, face_count, faces, self.privacy_mode)
                 
-                preview_info = " | Preview: On" if self.enable_face_preview else ""
-                logger.info(f"Detected {face_count} people | Status: {status}{preview_info} | Press Ctrl+C to exit")
+                # Display status in terminal when it changes, plus a periodic summary
+                self.log_status(captures, results)
+                self.metrics.observe('loop', time.monotonic() - frame_start)
                 
-                # Short delay to prevent CPU overload
-                time.sleep(self.detection_interval)
+                # Wait for the next detection deadline (skipped when benchmarking recorded footage)
+                if self.is_paced:
+                    self.scheduler.wait(self.detection_state(), frame_start)
                 
             except KeyboardInterrupt:
                 logger.info("Received interrupt signal, preparing to exit...")
@@ -565,36 +1124,86 @@ class PrivacyGuard:
         """Starts the Watch Out"""
         logger.info("Starting Dynamic Focus Assistant...")
 
-        if not self.load_model():
-            return False
+        # Model load (with warm-up) and camera open are slow and independent, run them together
+        durations = {}
 
-        if not self.initialize_camera():
+        def prepare_model():
+            started = time.perf_counter()
+            durations['model_ok'] = self.load_model()
+            loaded = time.perf_counter()
+            durations['model_load'] = loaded - started
+            if durations['model_ok']:
+                self.warm_up(self.warmup_runs)
+                durations['warm_up'] = time.perf_counter() - loaded
+
+        model_loader = threading.Thread(target=prepare_model, name="ModelLoader", daemon=True)
+        model_loader.start()
+        camera_start = time.perf_counter()
+        camera_ok = self.initialize_camera()
+        durations['camera_open'] = time.perf_counter() - camera_start
+        model_loader.join()
+
+        if not durations['model_ok'] or not camera_ok:
+            for channel in self.channels:
+                channel.close()
             return False
+        if len(self.channels) > 1:
+            logger.info(f"Monitoring {len(self.channels)} cameras with one model session "
+                        f"({'batched' if self.supports_batching else 'round-robin'} inference)")
+            if self.supports_batching:
+                self.warm_up(self.warmup_runs, len(self.channels))
+        self.startup.mark('model_and_camera',
+                          parts={name: durations[name] for name in ('model_load', 'warm_up', 'camera_open')
+                                 if name in durations})
 
         self.is_running = True
+        self.action_executor.start()
+        if self.save_detection_log:
+            from detection_recorder import DetectionRecorder
+            self.recorder = DetectionRecorder(self.detection_log_dir, self.max_log_size_mb,
+                                              self.detection_log_max_files)
+        if self.metrics_port > 0:
+            from metrics import MetricsServer
+            self.metrics_server = MetricsServer(self.metrics, self.metrics_port)
+            if not self.metrics_server.start():
+                self.metrics_server = None
 
-        # If preview is enabled, run directly in the main thread to handle GUI
-        if self.enable_face_preview:
-            logger.info("Preview mode enabled, running in main thread.")
-            try:
-                # In this mode, keyboard input is handled by cv2.waitKey()
-                self.run_detection_loop()
-            except KeyboardInterrupt:
-                logger.info("Exiting program...")
-            finally:
+        self.started_at = time.monotonic()
+        if self.daemon:
+            # Headless: no preview window, controlled through the local control socket
+            from control_server import ControlServer
+            self.overrides['enable_face_preview'] = self.enable_face_preview = False
+            self.control_server = ControlServer(self.control_socket_path, self.handle_command)
+            if not self.control_server.start():
+                self.control_server = None
+                self.is_running = False
                 self.stop()
-            return True
+                return False
+            signal.signal(signal.SIGTERM, lambda signum, frame: setattr(self, 'is_running', False))
+
+        # If preview is enabled, the main thread renders it (GUI calls must stay on the main thread)
+        if self.enable_face_preview:
+            from preview import PreviewRenderer
+            self.preview = PreviewRenderer(self.preview_fps, metrics=self.metrics)
+            if not self.preview.open():
+                self.preview = None
+                self.overrides['enable_face_preview'] = self.enable_face_preview = False
 
-        # If preview is not enabled, run in a background thread
+        # Detection always runs in a background thread
+        detection_thread = threading.Thread(target=self.run_detection_loop, name="Detection", daemon=True)
         try:
-            # Run detection in the background
-            detection_thread = threading.Thread(target=self.run_detection_loop, daemon=True)
             detection_thread.start()
 
             logger.info("Watch Out started!")
             logger.info("- Privacy mode will be activated automatically when multiple people are detected")
             logger.info("- Press Ctrl+C to exit")
 
+            if self.preview:
+                # In this mode, keyboard input is handled by cv2.waitKey()
+                logger.info(f"Preview mode enabled, showing up to {self.preview_fps} FPS.")
+                if self.preview.run(lambda: self.is_running and detection_thread.is_alive()):
+                    self.is_running = False
+
             # Wait in the main thread
             while detection_thread.is_alive():
                 detection_thread.join(0.1)
@@ -603,6 +1212,8 @@ class PrivacyGuard:
             logger.info("Exiting program...")
             self.is_running = False
         finally:
+            # Let the detection loop finish its current frame before releasing the cameras
+            detection_thread.join(2.0)
             self.stop()
 
         return True
@@ -610,30 +1221,130 @@ class PrivacyGuard:
     def stop(self):
         """Stops the Watch Out"""
         self.is_running = False
+        self.resume()  # Wakes a paused detection loop so it can exit
+        
+        if self.control_server:
+            self.control_server.stop()
+            self.control_server = None
         
-        if self.cap:
-            self.cap.release()
+        for channel in self.channels:
+            channel.close()
+        
+        if self.summary.frames:
+            logger.info(self.summary.report(time.monotonic()))
+        
+        if self.recorder:
+            self.recorder.close()
+            logger.info(f"Detection log: {self.recorder.records_written} frames recorded in {self.detection_log_dir}")
+            self.recorder = None
             
         self.remove_privacy_overlay()
         
-        # 確保關閉隱私保護應用程式
+        # 等待進行中的隱私動作完成，再確保關閉隱私保護應用程式
+        self.action_executor.stop()
         self.close_privacy_app()
         
-        cv2.destroyAllWindows()
+        if self.preview:
+            self.preview.close()
+            self.preview = None
+        
+        if self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
         
-        # Ensure all OpenCV windows are closed
-        for i in range(5):
-            cv2.waitKey(1)
+        if self.profile:
+            for line in self.metrics.report().splitlines():
+                logger.info(line)
             
         logger.info("Watch Out stopped")
 
+def read_control_socket_path(config_file=CONFIG_FILE):
+    """The daemon's control socket path, read without building a PrivacyGuard"""
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            user_config = json.load(f)
+        if isinstance(user_config, dict):
+            return user_config.get('control_socket_path', CONTROL_SOCKET_PATH)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to read user configuration: {e}")
+    return CONTROL_SOCKET_PATH
+
+
+def send_control_command(command):
+    """--control client: sends one command to the running daemon, prints the reply and exits"""
+    from control_server import send_command
+    socket_path = read_control_socket_path()
+    try:
+        reply = send_command(socket_path, command)
+    except OSError as e:
+        logger.error(f"Unable to reach the Watch Out daemon at {socket_path}: {e}")
+        sys.exit(1)
+    print(json.dumps(reply, ensure_ascii=False, indent=2))
+    sys.exit(0 if reply.get('ok') else 1)
+
+
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Watch Out - privacy protection assistant")
+    parser.add_argument('--source', choices=['camera', 'video', 'images', 'synthetic'],
+                        help="Frame source (default: from configuration)")
+    parser.add_argument('--daemon', action='store_true',
+                        help="Run headless and accept commands on the local control socket")
+    parser.add_argument('--control', metavar='COMMAND',
+                        help="Send a command to a running daemon: status, faces, pause, resume, "
+                             "'privacy on|off|auto' or stop")
+    parser.add_argument('--profile', action='store_true',
+                        help="Time every pipeline stage and print a latency report on exit")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="Print how long imports, configuration, model load, camera open, "
+                             "first frame and first inference took")
+    parser.add_argument('--autotune', action='store_true',
+                        help="Benchmark the model variants and execution providers again, ignoring the cached choice")
+    parser.add_argument('--cameras', type=int, nargs='+', metavar='INDEX',
+                        help="Camera indices to monitor together (default: from configuration)")
+    parser.add_argument('--source-path', help="Video file or image directory for --source video/images")
+    parser.add_argument('--pacing', choices=['realtime', 'fast'],
+                        help="realtime: play recorded footage at its frame rate; fast: as fast as possible")
+    args = parser.parse_args()
+    
+    # A control client only talks to the daemon, it stays out of the daemon's log file
+    if args.control:
+        send_control_command(args.control)
+    
+    setup_logging(LOG_LEVEL, LOG_FILE, MAX_LOG_SIZE_MB, LOG_BACKUP_COUNT)
     logger.info("🛡️  Dynamic Focus Assistant - Watch Out")
     logger.info("=" * 50)
     
+    startup = StartupTimer(IMPORT_START)
+    startup.mark('imports', IMPORTS_DONE)
     guard = PrivacyGuard()
+    guard.startup = startup
+    guard.startup_profile = args.startup_profile
+    
+    # Apply the user's log settings from privacy_guard_config.json
+    setup_logging(guard.log_level, guard.log_file, guard.max_log_size_mb, LOG_BACKUP_COUNT)
+    if args.daemon:
+        guard.daemon = True
+    if args.profile:
+        guard.profile = True
+        guard.metrics.enabled = True
+    if args.autotune:
+        guard.force_autotune = True
+    
+    # Command line settings survive configuration reloads
+    overrides = {
+        'frame_source_kind': args.source,
+        'camera_indices': args.cameras,
+        'frame_source_path': args.source_path,
+        'frame_pacing': args.pacing,
+    }
+    guard.overrides = {name: value for name, value in overrides.items() if value}
+    for name, value in guard.overrides.items():
+        setattr(guard, name, value)
     
+    startup.mark('config')
     if not guard.start():
         logger.error("Startup failed!")
         sys.exit(1)
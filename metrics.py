@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Metrics - Watch Out
+Per-stage latency histograms and counters, served as JSON on a local-only HTTP endpoint
+"""
+
+import json
+import math
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Log-spaced bucket upper bounds from 10 µs to ~100 s, 10% apart
+BUCKET_MIN = 1e-5
+BUCKET_GROWTH = 1.1
+BUCKET_COUNT = 170
+_LOG_GROWTH = math.log(BUCKET_GROWTH)
+
+PERCENTILES = (50, 95, 99)
+
+
+def _bucket(seconds):
+    if seconds <= BUCKET_MIN:
+        return 0
+    return min(BUCKET_COUNT - 1, int(math.log(seconds / BUCKET_MIN) / _LOG_GROWTH) + 1)
+
+
+def _bucket_upper(index):
+    return BUCKET_MIN * BUCKET_GROWTH ** index
+
+
+class RollingHistogram:
+    """Latency histogram over roughly the last `window` seconds
+
+    Samples go into the current half-window; percentiles combine it with the
+    previous half, so old samples age out without storing them. Percentiles are
+    bucket upper bounds, i.e. accurate to 10%.
+    """
+
+    def __init__(self, window=60.0):
+        self.half_window = window / 2
+        self._current = [0] * BUCKET_COUNT
+        self._previous = [0] * BUCKET_COUNT
+        self._rotated_at = time.monotonic()
+        self.count = 0      # Since start
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds, now):
+        if now - self._rotated_at >= self.half_window:
+            self._rotate(now)
+        self._current[_bucket(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def _rotate(self, now):
+        # After a long idle gap both halves are stale
+        stale = now - self._rotated_at >= 2 * self.half_window
+        self._previous = [0] * BUCKET_COUNT if stale else self._current
+        self._current = [0] * BUCKET_COUNT
+        self._rotated_at = now
+
+    def percentiles(self, now, percentiles=PERCENTILES):
+        """{p: seconds} over the rolling window, None when there are no recent samples"""
+        if now - self._rotated_at >= self.half_window:
+            self._rotate(now)
+        counts = [a + b for a, b in zip(self._current, self._previous)]
+        total = sum(counts)
+        if not total:
+            return {p: None for p in percentiles}
+        result = {}
+        for p in percentiles:
+            target = math.ceil(total * p / 100)
+            seen = 0
+            for index, count in enumerate(counts):
+                seen += count
+                if seen >= target:
+                    result[p] = min(_bucket_upper(index), self.max)
+                    break
+        return result
+
+
+class Metrics:
+    """Stage timers and counters; every call is a no-op when disabled"""
+
+    def __init__(self, enabled=False, window=60.0):
+        self.enabled = enabled
+        self.window = window
+        self.started = time.monotonic()
+        self.stages = {}    # name -> RollingHistogram, in first-seen order
+        self.counters = {}
+        self.gauges = {}    # name -> callable, read when a snapshot is taken
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        """Records one duration for a stage"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = RollingHistogram(self.window)
+            histogram.add(seconds, time.monotonic())
+
+    def count(self, name, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_gauge(self, name, read):
+        self.gauges[name] = read
+
+    def snapshot(self):
+        """Current metrics as a JSON-serializable dict, latencies in milliseconds"""
+        now = time.monotonic()
+        with self._lock:
+            stages = {}
+            for name, histogram in self.stages.items():
+                recent = histogram.percentiles(now)
+                stages[name] = {
+                    'count': histogram.count,
+                    'mean_ms': histogram.total / histogram.count * 1000 if histogram.count else None,
+                    'max_ms': histogram.max * 1000,
+                    **{f'p{p}_ms': (v * 1000 if v is not None else None) for p, v in recent.items()},
+                }
+            counters = dict(self.counters)
+        for name, read in self.gauges.items():
+            try:
+                counters[name] = read()
+            except Exception as e:
+                logger.debug(f"Gauge {name} failed: {e}")
+        return {
+            'uptime_s': now - self.started,
+            'window_s': self.window,
+            'counters': counters,
+            'stages': stages,
+        }
+
+    def report(self):
+        """Human readable table of the snapshot"""
+        snapshot = self.snapshot()
+        lines = [f"Profile after {snapshot['uptime_s']:.1f} s (percentiles over the last {self.window:.0f} s)",
+                 f"{'stage':<14}{'count':>8}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)"]
+
+        def fmt(value):
+            return f"{value:10.2f}" if value is not None else f"{'-':>10}"
+
+        for name, stage in snapshot['stages'].items():
+            lines.append(f"{name:<14}{stage['count']:>8}{fmt(stage['mean_ms'])}{fmt(stage['p50_ms'])}"
+                         f"{fmt(stage['p95_ms'])}{fmt(stage['p99_ms'])}{fmt(stage['max_ms'])}")
+        lines.append(" | ".join(f"{name}: {value}" for name, value in snapshot['counters'].items()))
+        return "\n".join(lines)
+
+
+class StartupTimer:
+    """Durations of the consecutive startup phases, for --startup-profile
+
+    Each mark() ends a phase that began where the previous one ended; marking
+    a phase again is ignored, so per-frame code can mark "first ..." phases.
+    A phase made of tasks that ran concurrently can list their own durations
+    as parts.
+    """
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.phases = {}  # name -> seconds, in order
+        self.parts = {}   # phase -> {task: seconds} for concurrent phases
+        self._last = self.started
+
+    def mark(self, phase, now=None, parts=None):
+        if phase in self.phases:
+            return
+        now = time.perf_counter() if now is None else now
+        self.phases[phase] = now - self._last
+        if parts:
+            self.parts[phase] = dict(parts)
+        self._last = now
+
+    @property
+    def total(self):
+        return self._last - self.started
+
+    def report(self):
+        """Human readable phase table"""
+        lines = [f"Startup took {self.total * 1000:.0f} ms"]
+        for phase, seconds in self.phases.items():
+            share = seconds / self.total if self.total > 0 else 0.0
+            lines.append(f"  {phase:<16}{seconds * 1000:9.1f} ms {share:6.1%}")
+            for task, task_seconds in self.parts.get(phase, {}).items():
+                lines.append(f"    {task:<14}{task_seconds * 1000:9.1f} ms (concurrent)")
+        return "\n".join(lines)
+
+
+class MetricsServer:
+    """Serves Metrics.snapshot() as JSON on GET /metrics, bound to localhost only"""
+
+    def __init__(self, metrics, port, host="127.0.0.1"):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = json.dumps(metrics.snapshot()).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"Metrics request: {format % args}")
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            logger.warning(f"Unable to start metrics endpoint on {self.host}:{self.port}: {e}")
+            return False
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="Metrics", daemon=True)
+        self._thread.start()
+        logger.info(f"Metrics endpoint: http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
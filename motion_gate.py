@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motion gate - Watch Out
+Cheap change detection so static scenes can reuse the last detection result
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Frame differencing on a tiny grayscale thumbnail
+
+    The current thumbnail is compared with the one taken at the last inference
+    (not the previous frame), so slow changes still add up and trigger a run.
+    A full inference is forced at least every max_interval seconds.
+    """
+
+    def __init__(self, threshold=0.02, max_interval=2.0, size=(32, 24)):
+        self.threshold = threshold        # Mean absolute difference, as a fraction of full scale
+        self.max_interval = max_interval
+        self.size = size                  # (width, height) of the thumbnail
+        self._small = None
+        self._gray = np.empty((size[1], size[0]), dtype=np.uint8)
+        self._reference = np.empty_like(self._gray)
+        self._diff = np.empty_like(self._gray)
+        self._has_reference = False
+        self._last_inference = 0.0
+
+        # Statistics
+        self.last_score = 0.0
+        self.inferences = 0
+        self.skipped = 0
+
+    def reset(self):
+        """Forces the next frame to be inferred"""
+        self._has_reference = False
+
+    def should_infer(self, frame, now=None):
+        """Returns True when the scene changed (or max_interval elapsed); the frame then becomes the reference"""
+        now = time.monotonic() if now is None else now
+
+        if frame.ndim == 2 or frame.shape[2] == 1:
+            cv2.resize(frame, self.size, dst=self._gray, interpolation=cv2.INTER_AREA)
+        else:
+            if self._small is None or self._small.shape[2] != frame.shape[2]:
+                self._small = np.empty((self.size[1], self.size[0], frame.shape[2]), dtype=np.uint8)
+            cv2.resize(frame, self.size, dst=self._small, interpolation=cv2.INTER_AREA)
+            cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+
+        if self._has_reference and now - self._last_inference < self.max_interval:
+            cv2.absdiff(self._gray, self._reference, dst=self._diff)
+            self.last_score = cv2.mean(self._diff)[0] / 255.0
+            if self.last_score < self.threshold:
+                self.skipped += 1
+                return False
+
+        np.copyto(self._reference, self._gray)
+        self._has_reference = True
+        self._last_inference = now
+        self.inferences += 1
+        return True
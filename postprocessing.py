@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Post-processing - Watch Out
+Turns the model heatmap into face bounding boxes
+"""
+
+import cv2
+import numpy as np
+
+
+class ComponentDecoder:
+    """Connected components on the thresholded heatmap
+
+    Areas and bounding boxes come from a single cv2.connectedComponentsWithStats
+    pass (4-connectivity, same labelling as scipy.ndimage.label) and the mean
+    confidence of every bounding box from one integral image, so the cost no
+    longer grows with components x pixels.
+    """
+
+    name = "components"
+    output_indices = (0,)  # heatmap only
+    min_area = 5  # Ignore too small regions
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        # heatmap is uint8, so thresholding the normalised value is a lookup on the raw value
+        self._binary_lut = (np.arange(256, dtype=np.float32) / 255.0 > threshold).astype(np.uint8)
+        self._binary = None
+        self._integral = None
+
+    def decode(self, heatmap, frame_w, frame_h):
+        """Returns (face_count, faces) with bboxes in frame coordinates"""
+        map_h, map_w = heatmap.shape
+        if self._binary is None or self._binary.shape != heatmap.shape:
+            self._binary = np.empty(heatmap.shape, dtype=np.uint8)
+            self._integral = np.empty((map_h + 1, map_w + 1), dtype=np.int32)
+
+        np.take(self._binary_lut, heatmap, out=self._binary)
+        num_labels, _, stats, _ = cv2.connectedComponentsWithStats(self._binary, connectivity=4, ltype=cv2.CV_32S)
+
+        stats = stats[1:]  # Drop the background label
+        stats = stats[stats[:, cv2.CC_STAT_AREA] >= self.min_area]
+        if len(stats) == 0:
+            return 0, []
+
+        min_col = stats[:, cv2.CC_STAT_LEFT]
+        min_row = stats[:, cv2.CC_STAT_TOP]
+        end_col = min_col + stats[:, cv2.CC_STAT_WIDTH]   # max_col + 1
+        end_row = min_row + stats[:, cv2.CC_STAT_HEIGHT]  # max_row + 1
+
+        # Average confidence of each bounding box region
+        cv2.integral(heatmap, self._integral, cv2.CV_32S)
+        ii = self._integral
+        region_sums = ii[end_row, end_col] - ii[min_row, end_col] - ii[end_row, min_col] + ii[min_row, min_col]
+        confidences = region_sums / (255.0 * (end_row - min_row) * (end_col - min_col))
+
+        # Convert to original image coordinates, kept within image bounds
+        x1 = np.clip((min_col * frame_w / map_w).astype(np.int64), 0, frame_w - 1)
+        y1 = np.clip((min_row * frame_h / map_h).astype(np.int64), 0, frame_h - 1)
+        x2 = np.maximum(x1 + 1, np.minimum((end_col * frame_w / map_w).astype(np.int64), frame_w))
+        y2 = np.maximum(y1 + 1, np.minimum((end_row * frame_h / map_h).astype(np.int64), frame_h))
+
+        detected_faces = [
+            {'bbox': bbox, 'confidence': confidence}
+            for bbox, confidence in zip(
+                zip(x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist()),
+                confidences.tolist(),
+            )
+        ]
+        return len(detected_faces), detected_faces
+
+
+class GridDecoder:
+    """Simple grid search: one face per grid cell whose peak confidence passes the threshold
+
+    The per-cell maximum is a single reshape/max over a zero-padded copy of the heatmap.
+    """
+
+    name = "grid"
+    output_indices = (0,)  # heatmap only
+    grid_size = 8  # Size of each grid
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self._normalize_lut = np.arange(256, dtype=np.float32) / 255.0
+        self._padded = None
+
+    def decode(self, heatmap, frame_w, frame_h):
+        """Returns (face_count, faces) with bboxes in frame coordinates"""
+        map_h, map_w = heatmap.shape
+        g = self.grid_size
+        grid_rows, grid_cols = -(-map_h // g), -(-map_w // g)
+        if self._padded is None or self._padded.shape != (grid_rows * g, grid_cols * g):
+            # Padding stays zero, which never passes a threshold in [0, 1]
+            self._padded = np.zeros((grid_rows * g, grid_cols * g), dtype=np.uint8)
+
+        self._padded[:map_h, :map_w] = heatmap
+        cell_max = self._padded.reshape(grid_rows, g, grid_cols, g).max(axis=(1, 3))
+        cell_confidence = self._normalize_lut[cell_max]
+
+        cell_rows, cell_cols = np.nonzero(cell_confidence > self.threshold)
+        if len(cell_rows) == 0:
+            return 0, []
+
+        # Calculate position in original image
+        i, j = cell_rows * g, cell_cols * g
+        x1 = (j * frame_w / map_w).astype(np.int64)
+        y1 = (i * frame_h / map_h).astype(np.int64)
+        x2 = ((j + g) * frame_w / map_w).astype(np.int64)
+        y2 = ((i + g) * frame_h / map_h).astype(np.int64)
+
+        detected_faces = [
+            {'bbox': bbox, 'confidence': confidence}
+            for bbox, confidence in zip(
+                zip(x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist()),
+                cell_confidence[cell_rows, cell_cols].tolist(),
+            )
+        ]
+        return len(detected_faces), detected_faces
+
+
+DECODERS = {decoder.name: decoder for decoder in (ComponentDecoder, GridDecoder)}
+
+
+def create_decoder(name, threshold):
+    """Builds the post-processor selected in the configuration"""
+    if name not in DECODERS:
+        raise ValueError(f"Unknown post-processor: {name} (available: {', '.join(DECODERS)})")
+    return DECODERS[name](threshold)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Preprocessing - Watch Out
+Converts camera frames into the model input tensor without per-frame allocations
+"""
+
+import cv2
+import numpy as np
+
+
+class Preprocessor:
+    """Writes grayscale, resized frames straight into a preallocated (1, 1, in_h, in_w) uint8 tensor
+
+    The returned tensor is reused on every call, so callers must consume it
+    (run inference) before preprocessing the next frame.
+    """
+
+    def __init__(self, in_w, in_h, input_tensor=None):
+        self.in_w = in_w
+        self.in_h = in_h
+        # A (1, 1, in_h, in_w) slice of a batch tensor can be passed in to fill one batch slot
+        self.input_tensor = input_tensor if input_tensor is not None else np.zeros((1, 1, in_h, in_w), dtype=np.uint8)
+        self._plane = self.input_tensor[0, 0]  # (in_h, in_w) view into the tensor
+        self._gray = None  # Full resolution grayscale buffer, only needed when resizing
+
+    def __call__(self, frame):
+        """Preprocesses a BGR frame or a single-channel luma plane, returns the input tensor"""
+        h, w = frame.shape[:2]
+        needs_resize = (h, w) != (self.in_h, self.in_w)
+        is_luma = frame.ndim == 2 or frame.shape[2] == 1
+
+        if is_luma:
+            # Source already delivers a luma plane, skip colour conversion
+            gray = frame if frame.ndim == 2 else frame[:, :, 0]
+            if not needs_resize:
+                np.copyto(self._plane, gray)
+                return self.input_tensor
+        elif not needs_resize:
+            # Frame already matches the model input, convert directly into the tensor
+            cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._plane)
+            return self.input_tensor
+        else:
+            if self._gray is None or self._gray.shape != (h, w):
+                self._gray = np.empty((h, w), dtype=np.uint8)
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+
+        cv2.resize(gray, (self.in_w, self.in_h), dst=self._plane)
+        return self.input_tensor
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Preview - Watch Out
+Draws the latest detection result in the preview window at its own frame rate,
+so GUI rendering never slows down detection
+"""
+
+import threading
+import time
+import logging
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+WINDOW_NAME = 'Watch Out - Face Detection Preview'
+EXIT_HINT = "Press ESC to exit"
+KEY_ESC = 27
+
+
+def confidence_color(confidence):
+    """Box colour by confidence"""
+    if confidence > 0.8:
+        return (0, 255, 0)  # Green - high confidence
+    if confidence > 0.6:
+        return (0, 255, 255)  # Yellow - medium confidence
+    return (255, 0, 0)  # Blue - low confidence
+
+
+class PreviewRenderer:
+    """Consumer of detection results that owns the preview window
+
+    The detection loop only hands over references with publish(). The renderer
+    runs on the main thread (GUI toolkits require it) at up to `fps`, redraws
+    only when a new result arrived, draws into one reused display buffer and
+    computes the static overlay layout once per frame size.
+    """
+
+    def __init__(self, fps=15.0, window_name=WINDOW_NAME, metrics=None):
+        self.fps = fps
+        self.metrics = metrics
+        self.window_name = window_name
+        self._lock = threading.Lock()
+        self._latest = None  # (frame, face_count, faces, privacy_mode)
+        self._sequence = 0
+        self._drawn_sequence = 0
+        self._display = None
+        self._hint_origin = None
+
+        # Statistics
+        self.frames_published = 0
+        self.frames_drawn = 0
+
+    def open(self):
+        """Creates the preview window, returns False if no GUI is available"""
+        logger.debug("Attempting to initialize preview window...")
+        try:
+            cv2.namedWindow(self.window_name, cv2.WINDOW_AUTOSIZE)
+            logger.info("Preview window initialized")
+            return True
+        except Exception as e:
+            logger.warning(f"Preview window initialization failed: {e}")
+            return False
+
+    def close(self):
+        cv2.destroyAllWindows()
+        # Ensure all OpenCV windows are closed
+        for _ in range(5):
+            cv2.waitKey(1)
+
+    def publish(self, frame, face_count, faces, privacy_mode):
+        """Hands the latest result to the renderer without copying or drawing (detection thread)
+
+        The frame must not be modified afterwards; frame sources return a new
+        array for every frame.
+        """
+        with self._lock:
+            self._latest = (frame, face_count, faces, privacy_mode)
+            self._sequence += 1
+            self.frames_published += 1
+
+    def run(self, is_running):
+        """Shows results until is_running() turns False, returns True if the user pressed ESC"""
+        frame_interval = 1.0 / self.fps if self.fps > 0 else 0.0
+        while is_running():
+            started = time.monotonic()
+            try:
+                if self.render() and self.metrics:
+                    self.metrics.observe('preview', time.monotonic() - started)
+                # Handle keyboard input, also keeps the window responsive between results
+                key = cv2.waitKey(1) & 0xFF
+            except Exception as e:
+                logger.warning(f"Error displaying preview window: {e}")
+                self.close()
+                return False
+
+            # On ESC key press, exit the program
+            if key == KEY_ESC:
+                logger.info("ESC key pressed, exiting...")
+                return True
+
+            remaining = frame_interval - (time.monotonic() - started)
+            if remaining > 0:
+                time.sleep(remaining)
+        return False
+
+    def render(self):
+        """Draws and shows the latest result if it has not been shown yet"""
+        with self._lock:
+            if self._latest is None or self._sequence == self._drawn_sequence:
+                return False
+            frame, face_count, faces, privacy_mode = self._latest
+            self._drawn_sequence = self._sequence
+
+        if self._display is None or self._display.shape != frame.shape:
+            self._display = np.empty_like(frame)
+            # Static overlay layout only depends on the frame width
+            (text_width, _), _ = cv2.getTextSize(EXIT_HINT, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)
+            self._hint_origin = (frame.shape[1] - text_width - 10, 30)
+        display_frame = self._display
+        np.copyto(display_frame, frame)
+
+        # Draw face boxes
+        for face in faces:
+            x1, y1, x2, y2 = face['bbox']
+            confidence = face['confidence']
+            color = confidence_color(confidence)
+            cv2.rectangle(display_frame, (x1, y1), (x2, y2), color, 2)
+            cv2.putText(display_frame, f'{confidence:.2f}',
+                        (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+
+        # Display status information
+        if privacy_mode:
+            status_text = "Privacy Mode"
+            status_color = (0, 0, 255)  # Red
+        else:
+            status_text = "Secure"
+            status_color = (0, 255, 0)  # Green
+        cv2.putText(display_frame, f'Detected {face_count} people | {status_text}',
+                    (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, status_color, 2)
+        cv2.putText(display_frame, EXIT_HINT, self._hint_origin,
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+
+        cv2.imshow(self.window_name, display_frame)
+        self.frames_drawn += 1
+        return True
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Privacy actions - Watch Out
+Runs privacy app launching/closing on a worker thread so detection never waits on it
+"""
+
+import threading
+import time
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+ACTION_ACTIVATE = "activate"
+ACTION_DEACTIVATE = "deactivate"
+
+
+class PrivacyActionExecutor:
+    """Single worker that drives the privacy app towards the latest requested state
+
+    Only the most recent request matters: while the worker is busy, an activate
+    followed by a deactivate (or the reverse) cancels out, and repeats of the
+    state already applied are dropped. Each executed action is reported back
+    through `results` and the optional on_result callback.
+    """
+
+    def __init__(self, handlers, on_result=None, history=20):
+        self.handlers = handlers  # action -> callable returning True on success
+        self.on_result = on_result
+        self.results = deque(maxlen=history)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._in_progress = None
+        self._applied = ACTION_DEACTIVATE  # No privacy app at startup
+        self._desired = ACTION_DEACTIVATE
+        self._requested_at = None
+
+        # Statistics
+        self.submitted = 0
+        self.executed = 0
+        self.coalesced = 0
+
+    def start(self):
+        """Starts the worker thread"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._worker_loop, name="PrivacyActions", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Lets the worker finish the pending action (up to timeout), then stops it"""
+        with self._cond:
+            deadline = time.monotonic() + timeout
+            while self._thread is not None and (self._in_progress or self._desired != self._applied):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("Privacy action still pending at shutdown")
+                    break
+                self._cond.wait(remaining)
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, action):
+        """Requests a state change without blocking"""
+        if action not in self.handlers:
+            raise ValueError(f"Unknown privacy action: {action}")
+        with self._cond:
+            self.submitted += 1
+            current = self._in_progress or self._applied
+            if self._desired != current:
+                # Replaces a request the worker has not picked up yet
+                self.coalesced += 1
+            self._desired = action
+            if action == current:
+                self._requested_at = None
+            elif self._requested_at is None:
+                self._requested_at = time.monotonic()
+            self._cond.notify_all()
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                while self._running and self._desired == self._applied:
+                    self._requested_at = None
+                    self._cond.wait()
+                if not self._running:
+                    return
+                action = self._desired
+                requested_at = self._requested_at or time.monotonic()
+                self._requested_at = None
+                self._in_progress = action
+
+            started_at = time.monotonic()
+            try:
+                success = bool(self.handlers[action]())
+            except Exception as e:
+                logger.error(f"Privacy action '{action}' failed: {e}")
+                success = False
+            finished_at = time.monotonic()
+
+            result = {
+                'action': action,
+                'success': success,
+                'queue_delay': started_at - requested_at,
+                'duration': finished_at - started_at,
+            }
+            with self._cond:
+                # Even a failed attempt counts as applied, so it is not retried on every frame
+                self._applied = action
+                self._in_progress = None
+                self.executed += 1
+                self.results.append(result)
+                self._cond.notify_all()
+
+            if self.on_result:
+                try:
+                    self.on_result(result)
+                except Exception as e:
+                    logger.warning(f"Privacy action callback failed: {e}")
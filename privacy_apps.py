@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Privacy apps - Watch Out
+Resolves the privacy app configuration into a launch plan once, and manages the
+processes it spawns: reuse or refocus a live instance instead of relaunching, reap dead ones
+"""
+
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import logging
+
+logger = logging.getLogger(__name__)
+
+LAUNCH_POPEN = "popen"  # Start the app and keep tracking its process
+LAUNCH_RUN = "run"      # Run a launcher command to completion, success is a zero exit code
+
+RUN_TIMEOUT = 10  # 秒
+
+
+class LaunchStep:
+    """One way of opening a privacy app, tried in plan order"""
+
+    def __init__(self, name, argv, kind, label):
+        self.name = name
+        self.argv = argv
+        self.kind = kind
+        self.label = label  # Where the step came from, for logging
+
+    def __repr__(self):
+        return f"LaunchStep({self.label}: {self.argv!r}, {self.kind})"
+
+
+def _split_command(command, platform):
+    if platform == "win32":
+        return command.split()
+    return shlex.split(command)
+
+
+def _command_steps(app_config, platform, label):
+    """Steps for one configured app: its command, then its fallback path"""
+    steps = []
+    name = app_config.get("name", "")
+    command = app_config.get("command", "").strip()
+    fallback_path = app_config.get("fallback_path", "")
+
+    if command:
+        try:
+            argv = _split_command(command, platform)
+        except ValueError as e:
+            logger.warning(f"無法解析 {name} 的開啟命令 '{command}': {e}")
+            argv = []
+        if argv and platform == "darwin":
+            # macOS launchers exit right away, their exit code tells whether the app opened
+            if argv[:2] == ["open", "-a"] and len(argv) == 2:
+                argv.append(name)
+            steps.append(LaunchStep(name, argv, LAUNCH_RUN, label))
+        elif argv:
+            if shutil.which(argv[0]) is None and not os.path.exists(argv[0]):
+                logger.warning(f"找不到 {name} 的執行檔: {argv[0]}")
+            steps.append(LaunchStep(name, argv, LAUNCH_POPEN, label))
+
+    if fallback_path:
+        if os.path.exists(fallback_path):
+            steps.append(LaunchStep(name, [fallback_path], LAUNCH_POPEN, f"{label} 備用路徑"))
+        else:
+            logger.warning(f"{name} 的備用路徑不存在: {fallback_path}")
+    return steps
+
+
+def build_launch_plan(privacy_apps, privacy_app_fallback, custom_path, platform=None):
+    """Resolves and validates the privacy app configuration into an ordered list of LaunchSteps
+
+    Order: custom path, the app configured for this platform (command, then
+    fallback path), then the fallback app.
+    """
+    platform = platform or sys.platform
+    plan = []
+
+    if custom_path:
+        if os.path.exists(custom_path):
+            plan.append(LaunchStep(os.path.basename(custom_path), [custom_path], LAUNCH_POPEN, "自訂路徑"))
+        else:
+            logger.warning(f"自訂應用程式路徑不存在: {custom_path}")
+
+    if platform in privacy_apps:
+        plan += _command_steps(privacy_apps[platform], platform, "主要應用程式")
+    else:
+        logger.warning(f"未設定 {platform} 的隱私保護應用程式")
+
+    if platform in privacy_app_fallback:
+        plan += _command_steps(privacy_app_fallback[platform], platform, "備用應用程式")
+
+    if not plan:
+        logger.error("隱私保護應用程式啟動計畫為空，請檢查配置")
+    else:
+        logger.debug(f"Privacy app launch plan: {plan}")
+    return plan
+
+
+class Backend:
+    """Platform specific window handling for a running privacy app"""
+
+    def refocus(self, process):
+        """Brings the app's window to the front, returns True if it did"""
+        return False
+
+
+class LinuxBackend(Backend):
+    def refocus(self, process):
+        if shutil.which("xdotool") is None:
+            return False
+        try:
+            result = subprocess.run(
+                ["xdotool", "search", "--onlyvisible", "--pid", str(process.pid), "windowactivate"],
+                capture_output=True, timeout=2,
+            )
+            return result.returncode == 0
+        except Exception as e:
+            logger.debug(f"xdotool refocus failed: {e}")
+            return False
+
+
+class WindowsBackend(Backend):
+    def refocus(self, process):
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            user32 = ctypes.windll.user32
+            found = []
+
+            @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+            def enum_window(hwnd, _):
+                pid = wintypes.DWORD()
+                user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+                if pid.value == process.pid and user32.IsWindowVisible(hwnd):
+                    found.append(hwnd)
+                    return False
+                return True
+
+            user32.EnumWindows(enum_window, 0)
+            if not found:
+                return False
+            user32.ShowWindow(found[0], 9)  # SW_RESTORE
+            return bool(user32.SetForegroundWindow(found[0]))
+        except Exception as e:
+            logger.debug(f"Window refocus failed: {e}")
+            return False
+
+
+def default_backend(platform=None):
+    platform = platform or sys.platform
+    if platform == "win32":
+        return WindowsBackend()
+    if platform.startswith("linux"):
+        return LinuxBackend()
+    # macOS relaunches through `open -a`, which already focuses a running app
+    return Backend()
+
+
+class PrivacyAppManager:
+    """Opens the privacy app from a cached launch plan and keeps track of what it spawned"""
+
+    def __init__(self, plan, backend=None):
+        self.plan = plan
+        self.backend = backend or default_backend()
+        self.processes = []  # Live processes started from the plan
+        self.launches = 0
+        self.reuses = 0
+
+    def set_plan(self, plan):
+        self.plan = plan
+
+    def reap(self):
+        """Forgets processes that have exited (and collects their exit status)"""
+        alive = []
+        for process in self.processes:
+            if process.poll() is None:
+                alive.append(process)
+            else:
+                logger.debug(f"Privacy app process {process.pid} exited with {process.returncode}")
+        self.processes = alive
+
+    @property
+    def running(self):
+        self.reap()
+        return bool(self.processes)
+
+    def activate(self):
+        """Reuses a live privacy app if there is one, otherwise walks the launch plan"""
+        self.reap()
+        if self.processes:
+            process = self.processes[-1]
+            self.reuses += 1
+            if self.backend.refocus(process):
+                logger.info(f"隱私保護應用程式已在執行中 (PID {process.pid})，已切換至前景")
+            else:
+                logger.info(f"隱私保護應用程式已在執行中 (PID {process.pid})，不重複開啟")
+            return True
+
+        for step in self.plan:
+            if self._launch(step):
+                self.launches += 1
+                return True
+
+        logger.error("無法開啟任何隱私保護應用程式，請檢查配置")
+        return False
+
+    def _launch(self, step):
+        logger.info(f"正在開啟隱私保護應用程式: {step.name} ({step.label})")
+        try:
+            if step.kind == LAUNCH_RUN:
+                result = subprocess.run(step.argv, capture_output=True, text=True, timeout=RUN_TIMEOUT)
+                if result.returncode != 0:
+                    logger.warning(f"{step.name} 開啟命令執行失敗: {result.stderr.strip()}")
+                    return False
+            else:
+                self.processes.append(subprocess.Popen(step.argv))
+            logger.info(f"{step.name} 已成功開啟")
+            return True
+        except subprocess.TimeoutExpired:
+            logger.warning(f"{step.name} 開啟命令逾時")
+        except Exception as e:
+            logger.warning(f"開啟 {step.name} 失敗: {e}")
+        return False
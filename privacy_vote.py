@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Privacy vote - Watch Out
+Time-windowed voting over recent face counts, so single flickers neither restart
+the privacy_delay countdown nor tear privacy mode down
+"""
+
+from collections import deque
+
+
+class TimeWindowVote:
+    """Share of the last `window` seconds during which a condition held
+
+    Each sample holds until the next one (the newest until now), so the result
+    does not depend on how fast frames are sampled. Missing history counts as
+    the condition not holding. The vote passes once that share reaches `ratio`,
+    which gives a fixed decision latency of ratio * window for a condition that
+    starts holding continuously. Adding a sample is amortized O(1). A window
+    of 0 passes as soon as the latest sample holds.
+    """
+
+    def __init__(self, window, ratio):
+        if window < 0 or not 0.0 < ratio <= 1.0:
+            raise ValueError("window must be non-negative and ratio in (0, 1]")
+        self.window = window
+        self.ratio = ratio
+        self._samples = deque()  # (timestamp, holds)
+        self._closed_true = 0.0  # Duration of finished intervals in the deque where the condition held
+
+    @property
+    def latency(self):
+        """Time to pass after the condition starts holding continuously"""
+        return self.ratio * self.window
+
+    def reset(self):
+        self._samples.clear()
+        self._closed_true = 0.0
+
+    def add(self, timestamp, holds):
+        """Records whether the condition holds at timestamp"""
+        if self._samples:
+            last_time, last_holds = self._samples[-1]
+            if last_holds:
+                self._closed_true += timestamp - last_time
+        self._samples.append((timestamp, bool(holds)))
+        self._evict(timestamp)
+
+    def _evict(self, now):
+        """Drops samples whose interval ended before the window started"""
+        window_start = now - self.window
+        while len(self._samples) >= 2 and self._samples[1][0] <= window_start:
+            first_time, first_holds = self._samples.popleft()
+            if first_holds:
+                self._closed_true -= self._samples[0][0] - first_time
+
+    def fraction(self, now):
+        """Share of the window [now - window, now] during which the condition held"""
+        self._evict(now)
+        if not self._samples:
+            return 0.0
+        if self.window == 0:
+            return 1.0 if self._samples[-1][1] else 0.0
+        held = self._closed_true
+        last_time, last_holds = self._samples[-1]
+        if last_holds:
+            held += now - last_time
+
+        # The oldest interval may start before the window, clip it
+        window_start = now - self.window
+        first_time, first_holds = self._samples[0]
+        if first_holds and first_time < window_start:
+            held -= window_start - first_time
+        return max(0.0, held) / self.window
+
+    def passed(self, now):
+        return self.fraction(now) >= self.ratio - 1e-9
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Detection scheduler - Watch Out
+Paces the detection loop against deadlines, at a rate that depends on the privacy state
+"""
+
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATE_IDLE = "idle"              # No one or one person, privacy mode off
+STATE_CONFIRMING = "confirming"  # Multiple people seen, waiting out privacy_delay
+STATE_ACTIVE = "active"          # Privacy mode on
+
+
+class DetectionScheduler:
+    """Fixed-rate deadlines per state instead of a constant sleep after each frame
+
+    The frame period is the state's interval (not interval + inference time).
+    When processing overruns a deadline the schedule restarts from now instead
+    of bursting to catch up, and the interval never drops below the smoothed
+    processing latency, so work cannot pile up.
+    """
+
+    def __init__(self, idle_interval, confirm_interval, active_interval, smoothing=0.2):
+        self.set_intervals(idle_interval, confirm_interval, active_interval)
+        self.smoothing = smoothing
+        self.state = STATE_IDLE
+        self.latency = None  # Exponentially smoothed processing time per frame (seconds)
+        self.missed_deadlines = 0
+
+    def set_intervals(self, idle_interval, confirm_interval, active_interval):
+        """Changes the per-state intervals, the next deadline already uses them"""
+        self.intervals = {
+            STATE_IDLE: idle_interval,
+            STATE_CONFIRMING: confirm_interval,
+            STATE_ACTIVE: active_interval,
+        }
+        self._deadline = None
+
+    def interval_for(self, state):
+        """Effective frame period for a state, never shorter than what processing takes"""
+        interval = self.intervals[state]
+        if self.latency is not None:
+            interval = max(interval, self.latency)
+        return interval
+
+    def wait(self, state, frame_start):
+        """Records the latency of the frame that began at frame_start and sleeps until the next deadline"""
+        now = time.monotonic()
+        latency = now - frame_start
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.smoothing * (latency - self.latency)
+
+        interval = self.interval_for(state)
+        if state != self.state or self._deadline is None:
+            logger.debug(f"Detection schedule: {self.state} -> {state} ({interval * 1000:.0f} ms)")
+            self.state = state
+            self._deadline = frame_start + interval
+        else:
+            self._deadline += interval
+
+        if self._deadline <= now:
+            # Overran the slot, start a fresh schedule rather than catching up
+            self.missed_deadlines += 1
+            self._deadline = now
+            return
+
+        time.sleep(self._deadline - now)
@@ -25,14 +25,66 @@ class ConfigManager:
         default_config = {
             'detection_threshold': DETECTION_THRESHOLD,
             'privacy_delay': PRIVACY_DELAY,
+            'privacy_activation_ratio': PRIVACY_ACTIVATION_RATIO,
+            'privacy_deactivation_window': PRIVACY_DEACTIVATION_WINDOW,
+            'privacy_deactivation_ratio': PRIVACY_DEACTIVATION_RATIO,
             'camera_index': CAMERA_INDEX,
+            'camera_indices': CAMERA_INDICES,
             'detection_interval': DETECTION_INTERVAL,
+            'detection_interval_confirm': DETECTION_INTERVAL_CONFIRM,
+            'detection_interval_active': DETECTION_INTERVAL_ACTIVE,
+            'motion_gate_enabled': MOTION_GATE_ENABLED,
+            'motion_threshold': MOTION_THRESHOLD,
+            'motion_max_interval': MOTION_MAX_INTERVAL,
+            'tiled_detection_enabled': TILED_DETECTION_ENABLED,
+            'tiled_camera_width': TILED_CAMERA_WIDTH,
+            'tiled_camera_height': TILED_CAMERA_HEIGHT,
+            'tile_columns': TILE_COLUMNS,
+            'tile_rows': TILE_ROWS,
+            'tile_overlap': TILE_OVERLAP,
+            'tiles_per_frame': TILES_PER_FRAME,
+            'tiled_full_pass_interval': TILED_FULL_PASS_INTERVAL,
+            'tracker_enabled': TRACKER_ENABLED,
+            'tracker_iou_threshold': TRACKER_IOU_THRESHOLD,
+            'tracker_min_hits': TRACKER_MIN_HITS,
+            'tracker_max_misses': TRACKER_MAX_MISSES,
             'enable_face_preview': ENABLE_FACE_PREVIEW,
+            'preview_fps': PREVIEW_FPS,
+            'log_level': LOG_LEVEL,
+            'log_file': LOG_FILE,
+            'max_log_size_mb': MAX_LOG_SIZE_MB,
+            'log_summary_interval': LOG_SUMMARY_INTERVAL,
+            'log_count_hold': LOG_COUNT_HOLD,
+            'metrics_enabled': METRICS_ENABLED,
+            'metrics_port': METRICS_PORT,
+            'control_socket_path': CONTROL_SOCKET_PATH,
+            'config_reload_interval': CONFIG_RELOAD_INTERVAL,
+            'save_detection_log': SAVE_DETECTION_LOG,
+            'detection_log_dir': DETECTION_LOG_DIR,
+            'detection_log_max_files': DETECTION_LOG_MAX_FILES,
+            'postprocessor': POSTPROCESSOR,
             
             # 隱私保護應用程式配置
             'privacy_apps': PRIVACY_APPS,
             'privacy_app_fallback': PRIVACY_APP_FALLBACK,
             'privacy_app_custom_path': PRIVACY_APP_CUSTOM_PATH,
+            
+            # ONNX Runtime 設定
+            'ort_graph_optimization_level': ORT_GRAPH_OPTIMIZATION_LEVEL,
+            'ort_intra_op_threads': ORT_INTRA_OP_THREADS,
+            'ort_inter_op_threads': ORT_INTER_OP_THREADS,
+            'ort_execution_mode': ORT_EXECUTION_MODE,
+            'ort_enable_mem_pattern': ORT_ENABLE_MEM_PATTERN,
+            'ort_enable_cpu_mem_arena': ORT_ENABLE_CPU_MEM_ARENA,
+            'model_cache_dir': MODEL_CACHE_DIR,
+            'execution_providers': EXECUTION_PROVIDERS,
+            'warmup_runs': WARMUP_RUNS,
+            'model_variants': MODEL_VARIANTS,
+            'autotune_enabled': AUTOTUNE_ENABLED,
+            'autotune_calibration_path': AUTOTUNE_CALIBRATION_PATH,
+            'autotune_frames': AUTOTUNE_FRAMES,
+            'autotune_min_agreement': AUTOTUNE_MIN_AGREEMENT,
+            'autotune_min_face_frames': AUTOTUNE_MIN_FACE_FRAMES,
         }
         
         if os.path.exists(self.config_file):
@@ -48,9 +100,12 @@ class ConfigManager:
     def save_config(self):
         """儲存配置檔案"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
+            # 先寫入暫存檔再替換，執行中的 Watch Out 不會讀到寫到一半的檔案
+            temp_file = self.config_file + ".tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
                 json.dump(self.config, f, indent=2, ensure_ascii=False)
-            logger.info("✅ 配置已儲存")
+            os.replace(temp_file, self.config_file)
+            logger.info("✅ 配置已儲存 (執行中的 Watch Out 會自動套用)")
         except Exception as e:
             logger.error(f"❌ 儲存配置失敗: {e}")
             
@@ -73,7 +128,7 @@ class ConfigManager:
         
         privacy_apps = self.config.get('privacy_apps', {})
         for os_name, app_config in privacy_apps.items():
-            os_display = {"darwin": "macOS", "win32": "Windows"}.get(os_name, os_name)
+            os_display = {"darwin": "macOS", "win32": "Windows", "linux": "Linux"}.get(os_name, os_name)
             logger.info(f"\n{os_display}:")
             logger.info(f"  應用程式名稱: {app_config.get('name', '未設定')}")
             logger.info(f"  開啟命令: {app_config.get('command', '未設定')}")
@@ -83,7 +138,7 @@ class ConfigManager:
         if fallback_apps:
             logger.info("\n備用應用程式:")
             for os_name, app_config in fallback_apps.items():
-                os_display = {"darwin": "macOS", "win32": "Windows"}.get(os_name, os_name)
+                os_display = {"darwin": "macOS", "win32": "Windows", "linux": "Linux"}.get(os_name, os_name)
                 logger.info(f"  {os_display}: {app_config.get('name', '未設定')}")
     
     def modify_privacy_apps(self):
@@ -95,6 +150,7 @@ class ConfigManager:
             logger.info("2. 修改 Windows 應用程式")
             logger.info("3. 設定自訂應用程式路徑")
             logger.info("4. 測試開啟應用程式")
+            logger.info("5. 修改 Linux 應用程式")
             logger.info("0. 返回上級選單")
             
             try:
@@ -112,6 +168,8 @@ class ConfigManager:
                     logger.info("✅ 自訂路徑已更新")
                 elif choice == 4:
                     self.test_privacy_app()
+                elif choice == 5:
+                    self.modify_os_app("linux", "Linux")
                 else:
                     logger.error("❌ 無效選項")
                     
@@ -146,6 +204,8 @@ class ConfigManager:
             logger.info("macOS 命令範例: open -a 'Google Chrome'")
         elif os_key == "win32":
             logger.info("Windows 命令範例: msedge.exe, notepad.exe")
+        elif os_key == "linux":
+            logger.info("Linux 命令範例: firefox, gnome-text-editor")
             
         new_command = input(f"輸入新的開啟命令 (當前: {current_app.get('command', '未設定')}): ").strip()
         if new_command:
@@ -165,63 +225,26 @@ class ConfigManager:
         logger.info("\n🧪 測試隱私保護應用程式...")
         
         try:
-            # 臨時匯入必要的模組來測試
-            import subprocess
-            import sys
-            
-            current_os = sys.platform
-            privacy_apps = self.config.get('privacy_apps', {})
-            custom_path = self.config.get('privacy_app_custom_path', '')
+            # 使用與 Watch Out 相同的啟動計畫來測試
+            from privacy_apps import PrivacyAppManager, build_launch_plan
             
-            # 如果有自訂路徑，優先測試
-            if custom_path and os.path.exists(custom_path):
-                try:
-                    subprocess.Popen([custom_path])
-                    logger.info("✅ 自訂路徑應用程式開啟成功")
-                    return
-                except Exception as e:
-                    logger.error(f"❌ 自訂路徑開啟失敗: {e}")
-            
-            # 測試當前系統的應用程式
-            if current_os not in privacy_apps:
-                logger.error(f"❌ 未設定 {current_os} 的應用程式配置")
+            plan = build_launch_plan(
+                self.config.get('privacy_apps', {}),
+                self.config.get('privacy_app_fallback', {}),
+                self.config.get('privacy_app_custom_path', ''),
+            )
+            if not plan:
+                logger.error(f"❌ 未設定 {sys.platform} 的應用程式配置")
                 return
             
-            app_config = privacy_apps[current_os]
-            app_name = app_config.get('name', '未知應用程式')
-            app_command = app_config.get('command', '')
-            
-            if not app_command:
-                logger.error("❌ 未設定開啟命令")
-                return
+            for step in plan:
+                logger.info(f"  {step.label}: {step.name} -> {' '.join(step.argv)}")
             
-            logger.info(f"正在測試開啟: {app_name}")
-            
-            if current_os == "darwin":  # macOS
-                if app_command.startswith("open -a"):
-                    app_name_from_cmd = app_command.split("'")[1] if "'" in app_command else app_name
-                    result = subprocess.run([
-                        "open", "-a", app_name_from_cmd
-                    ], capture_output=True, text=True, timeout=10)
-                    
-                    if result.returncode == 0:
-                        logger.info(f"✅ {app_name} 開啟成功")
-                    else:
-                        logger.error(f"❌ 開啟失敗: {result.stderr}")
-                else:
-                    cmd_parts = app_command.split()
-                    subprocess.run(cmd_parts, capture_output=True, text=True, timeout=10)
-                    logger.info(f"✅ {app_name} 開啟成功")
-                    
-            elif current_os == "win32":  # Windows
-                cmd_parts = app_command.split()
-                subprocess.Popen(cmd_parts)
-                logger.info(f"✅ {app_name} 開啟成功")
+            if PrivacyAppManager(plan).activate():
+                logger.info("✅ 隱私保護應用程式開啟成功")
             else:
-                logger.error(f"❌ 不支援的作業系統: {current_os}")
+                logger.error("❌ 開啟失敗")
                 
-        except subprocess.TimeoutExpired:
-            logger.error("❌ 開啟命令逾時")
         except Exception as e:
             logger.error(f"❌ 測試失敗: {e}")
         
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tiling - Watch Out
+Overlapping tiles of a high-resolution frame, so distant faces cover enough
+heatmap cells to be detected, with an adaptive per-frame tile budget
+"""
+
+import time
+
+
+def tile_grid(frame_w, frame_h, columns, rows, overlap):
+    """(x1, y1, x2, y2) tiles covering the frame, neighbours overlapping by `overlap` of a tile"""
+    tile_w = frame_w / (columns - (columns - 1) * overlap)
+    tile_h = frame_h / (rows - (rows - 1) * overlap)
+    step_x = tile_w * (1 - overlap)
+    step_y = tile_h * (1 - overlap)
+    tiles = []
+    for row in range(rows):
+        for column in range(columns):
+            x1 = int(round(column * step_x))
+            y1 = int(round(row * step_y))
+            tiles.append((x1, y1, min(frame_w, int(round(x1 + tile_w))), min(frame_h, int(round(y1 + tile_h)))))
+    return tiles
+
+
+def _overlap(a, b):
+    """Intersection over the smaller box: a coarse full-frame box containing a tile box counts as the same face"""
+    iw = min(a[2], b[2]) - max(a[0], b[0])
+    ih = min(a[3], b[3]) - max(a[1], b[1])
+    if iw <= 0 or ih <= 0:
+        return 0.0
+    smaller = min((a[2] - a[0]) * (a[3] - a[1]), (b[2] - b[0]) * (b[3] - b[1]))
+    return iw * ih / smaller if smaller > 0 else 0.0
+
+
+def merge_detections(faces, overlap_threshold=0.5):
+    """Drops duplicate faces (seen by overlapping tiles, or by a tile and the full frame), keeping the most confident"""
+    kept = []
+    for face in sorted(faces, key=lambda f: f['confidence'], reverse=True):
+        if all(_overlap(face['bbox'], other['bbox']) <= overlap_threshold for other in kept):
+            kept.append(face)
+    return kept
+
+
+class FrameTiler:
+    """Decides which tiles of a camera's frames to run and merges their results
+
+    Every `full_pass_interval` seconds all tiles run on the same frame. In
+    between, each frame runs at most `tiles_per_frame` tiles: tiles that
+    contained faces on their last run first, then the tiles that have gone
+    the longest without a run. Tiles keep their last result until they run
+    again, so the merged result always covers the whole frame. Tiles are
+    scheduled whether or not the motion gate skips the full frame: a distant
+    face changes too few pixels to move the whole-frame score.
+    """
+
+    def __init__(self, columns=2, rows=2, overlap=0.15, tiles_per_frame=1, full_pass_interval=2.0):
+        self.columns = columns
+        self.rows = rows
+        self.overlap = overlap
+        self.tiles_per_frame = tiles_per_frame
+        self.full_pass_interval = full_pass_interval
+        self.tiles = []
+        self._frame_size = None
+        self._results = []    # Faces in frame coordinates per tile, from its last run
+        self._full_frame_faces = []  # Faces of the last full-frame run
+        self._last_run = []   # Time of each tile's last run
+        self._last_full_pass = None
+
+        # Statistics
+        self.tiles_run = 0
+        self.full_passes = 0
+
+    def reset(self):
+        self._frame_size = None
+
+    def schedule(self, frame_w, frame_h, now=None):
+        """Indices of the tiles to run on this frame"""
+        now = time.monotonic() if now is None else now
+        if self._frame_size != (frame_w, frame_h):
+            self._frame_size = (frame_w, frame_h)
+            self.tiles = tile_grid(frame_w, frame_h, self.columns, self.rows, self.overlap)
+            self._results = [[] for _ in self.tiles]
+            self._last_run = [0.0] * len(self.tiles)
+            self._full_frame_faces = []
+            self._last_full_pass = None
+
+        if self._last_full_pass is None or now - self._last_full_pass >= self.full_pass_interval:
+            self._last_full_pass = now
+            self.full_passes += 1
+            return list(range(len(self.tiles)))
+
+        # Tiles with faces first, each group oldest first
+        order = sorted(range(len(self.tiles)), key=lambda i: (not self._results[i], self._last_run[i]))
+        return order[:self.tiles_per_frame]
+
+    def crops(self, frame, indices):
+        """Views of the frame for the given tiles (no copies)"""
+        return [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in (self.tiles[i] for i in indices)]
+
+    def update(self, indices, detections, now=None):
+        """Stores the (count, faces) results of the tiles that ran, moved to frame coordinates"""
+        now = time.monotonic() if now is None else now
+        for i, (_, faces) in zip(indices, detections):
+            x_offset, y_offset = self.tiles[i][:2]
+            self._results[i] = [
+                {**face, 'bbox': (face['bbox'][0] + x_offset, face['bbox'][1] + y_offset,
+                                  face['bbox'][2] + x_offset, face['bbox'][3] + y_offset)}
+                for face in faces
+            ]
+            self._last_run[i] = now
+        self.tiles_run += len(indices)
+
+    def merge(self, full_frame_faces=None):
+        """(count, faces) combining the full-frame detections with the latest result of every tile
+
+        full_frame_faces is None when the full frame was not run; its last result is used instead.
+        """
+        if full_frame_faces is not None:
+            self._full_frame_faces = list(full_frame_faces)
+        faces = list(self._full_frame_faces)
+        for tile_faces in self._results:
+            faces.extend(tile_faces)
+        faces = merge_detections(faces)
+        return len(faces), faces
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Face tracker - Watch Out
+Links per-frame detections into tracks with stable IDs so the loop can coast between inferences
+"""
+
+import itertools
+
+import numpy as np
+
+
+class Track:
+    """One face followed across frames"""
+
+    def __init__(self, track_id, bbox, confidence, timestamp):
+        self.track_id = track_id
+        self.bbox = np.asarray(bbox, dtype=np.float64)
+        self.confidence = confidence
+        self.velocity = np.zeros(2)  # Bbox centre velocity in pixels per second
+        self.first_seen = timestamp
+        self.last_update = timestamp
+        self.hits = 1     # Detections matched to this track
+        self.misses = 0   # Consecutive inferences without a match
+
+    def predicted_bbox(self, timestamp):
+        """Bbox moved along the estimated velocity up to timestamp"""
+        shift = self.velocity * max(0.0, timestamp - self.last_update)
+        return self.bbox + np.concatenate([shift, shift])
+
+    def update(self, bbox, confidence, timestamp, smoothing=0.5):
+        bbox = np.asarray(bbox, dtype=np.float64)
+        dt = timestamp - self.last_update
+        if dt > 0:
+            old_centre = (self.bbox[:2] + self.bbox[2:]) / 2
+            new_centre = (bbox[:2] + bbox[2:]) / 2
+            self.velocity += smoothing * ((new_centre - old_centre) / dt - self.velocity)
+        self.bbox = bbox
+        self.confidence = confidence
+        self.last_update = timestamp
+        self.hits += 1
+        self.misses = 0
+
+    def as_face(self, timestamp):
+        """Detection dict in the same format as detect_faces, plus track_id and age (seconds)"""
+        x1, y1, x2, y2 = (int(round(v)) for v in self.predicted_bbox(timestamp))
+        return {
+            'bbox': (x1, y1, x2, y2),
+            'confidence': self.confidence,
+            'track_id': self.track_id,
+            'age': timestamp - self.first_seen,
+        }
+
+
+class FaceTracker:
+    """Greedy IoU matching of detections to predicted track positions
+
+    A track is confirmed after min_hits matched detections and survives up to
+    max_misses inferences without a match, which absorbs single-frame false
+    positives and missed detections alike.
+    """
+
+    def __init__(self, iou_threshold=0.3, min_hits=2, max_misses=3):
+        self.iou_threshold = iou_threshold
+        self.min_hits = min_hits
+        self.max_misses = max_misses
+        self.tracks = []
+        self._ids = itertools.count(1)
+
+    def reset(self):
+        self.tracks = []
+
+    @property
+    def confirmed_tracks(self):
+        return [t for t in self.tracks if t.hits >= self.min_hits]
+
+    def has_tentative(self):
+        """Whether some track still waits for min_hits matches, i.e. needs more inferences to be confirmed"""
+        return any(t.hits < self.min_hits for t in self.tracks)
+
+    def update(self, faces, timestamp):
+        """Feeds the detections of a fresh inference, returns (confirmed_count, confirmed_faces)"""
+        boxes = np.array([face['bbox'] for face in faces], dtype=np.float64).reshape(-1, 4)
+        predicted = np.array([t.predicted_bbox(timestamp) for t in self.tracks]).reshape(-1, 4)
+
+        matched_tracks, matched_faces = set(), set()
+        if len(boxes) and len(predicted):
+            iou = iou_matrix(predicted, boxes)
+            # Greedy assignment, best overlaps first
+            for flat in np.argsort(iou, axis=None)[::-1]:
+                ti, fi = divmod(int(flat), iou.shape[1])
+                if iou[ti, fi] < self.iou_threshold:
+                    break
+                if ti in matched_tracks or fi in matched_faces:
+                    continue
+                self.tracks[ti].update(boxes[fi], faces[fi]['confidence'], timestamp)
+                matched_tracks.add(ti)
+                matched_faces.add(fi)
+
+        for ti, track in enumerate(self.tracks):
+            if ti not in matched_tracks:
+                track.misses += 1
+        self.tracks = [t for t in self.tracks if t.misses <= self.max_misses]
+
+        for fi, face in enumerate(faces):
+            if fi not in matched_faces:
+                self.tracks.append(Track(next(self._ids), face['bbox'], face['confidence'], timestamp))
+
+        return self.predict(timestamp)
+
+    def predict(self, timestamp):
+        """Coasts the confirmed tracks to timestamp without a new inference, returns (count, faces)"""
+        faces = [t.as_face(timestamp) for t in self.confirmed_tracks]
+        return len(faces), faces
+
+
+def iou_matrix(a, b):
+    """Pairwise IoU between two (N, 4) and (M, 4) arrays of x1, y1, x2, y2 boxes"""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)